@@ -0,0 +1,132 @@
+# Este código implementa um harness de benchmark para estimar empiricamente a complexidade de uma função.
+# Cada tamanho de entrada é medido com aquecimento e várias repetições usando time.perf_counter_ns,
+# e o expoente de crescimento é ajustado por regressão linear no espaço log-log, com intervalo de confiança.
+# Também estima o tamanho de cruzamento (crossover) a partir do qual uma implementação passa a ser mais lenta que outra.
+# Não são necessárias bibliotecas externas, apenas o Python padrão.
+
+import math
+import statistics
+import time
+
+
+def funcao_O_n(n):
+    soma = 0
+    for i in range(n):
+        soma += i
+    return soma
+
+
+def funcao_O_n2(n):
+    soma = 0
+    for i in range(n):
+        for j in range(n):
+            soma += i + j
+    return soma
+
+
+def medir(funcao, argumento, repeticoes=7, aquecimento=2):
+    # Execuções de aquecimento (caches, alocador, etc.) não entram na amostra
+    for _ in range(aquecimento):
+        funcao(argumento)
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter_ns()
+        funcao(argumento)
+        tempos.append(time.perf_counter_ns() - inicio)
+    return tempos
+
+
+def benchmark(funcao, tamanhos, gerador=None, repeticoes=7, aquecimento=2):
+    # O gerador transforma o tamanho n na entrada real da função (lista, grafo, ...)
+    resultados = {}
+    for n in tamanhos:
+        argumento = gerador(n) if gerador else n
+        resultados[n] = medir(funcao, argumento, repeticoes, aquecimento)
+    return resultados
+
+
+def quantil_t(confianca, graus_liberdade):
+    # Quantil bicaudal da distribuição t de Student: fórmulas exatas para 1 e 2 graus de liberdade, onde a
+    # aproximação de Cornish-Fisher erra muito (9.71 em vez de 12.71 a 95% com 1 grau), e ela a partir de 3
+    v = graus_liberdade
+    if v == 1:
+        return math.tan(math.pi * confianca / 2)
+    if v == 2:
+        return confianca * math.sqrt(2 / (1 - confianca ** 2))
+    z = statistics.NormalDist().inv_cdf(0.5 + confianca / 2)
+    return (z
+            + (z ** 3 + z) / (4 * v)
+            + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * v ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * v ** 3))
+
+
+def ajustar_expoente(resultados, confianca=0.95):
+    # Regressão log(t) = log(c) + k * log(n) usando a mediana de cada tamanho
+    xs = [math.log(n) for n in resultados]
+    ys = [math.log(max(statistics.median(tempos), 1)) for tempos in resultados.values()]
+    m = len(xs)
+    if m < 3:
+        raise ValueError("São necessários pelo menos 3 tamanhos para o ajuste")
+
+    media_x = statistics.fmean(xs)
+    media_y = statistics.fmean(ys)
+    sxx = sum((x - media_x) ** 2 for x in xs)
+    sxy = sum((x - media_x) * (y - media_y) for x, y in zip(xs, ys))
+    expoente = sxy / sxx
+    intercepto = media_y - expoente * media_x
+
+    residuos = [y - (intercepto + expoente * x) for x, y in zip(xs, ys)]
+    erro_padrao = math.sqrt(sum(r * r for r in residuos) / (m - 2) / sxx)
+    margem = quantil_t(confianca, m - 2) * erro_padrao
+
+    return {
+        "expoente": expoente,
+        "constante_ns": math.exp(intercepto),
+        "intervalo": (expoente - margem, expoente + margem),
+        "confianca": confianca,
+    }
+
+
+def ponto_de_cruzamento(ajuste_a, ajuste_b):
+    # Resolve c_a * n^k_a = c_b * n^k_b; retorna None se as curvas não se cruzam
+    diferenca = ajuste_b["expoente"] - ajuste_a["expoente"]
+    if abs(diferenca) < 1e-12:
+        return None
+    log_n = (math.log(ajuste_a["constante_ns"]) - math.log(ajuste_b["constante_ns"])) / diferenca
+    return math.exp(log_n)
+
+
+def relatorio(nome, resultados, ajuste):
+    print(f"{nome}:")
+    for n, tempos in resultados.items():
+        print(f"  n={n:>6}: mediana {statistics.median(tempos) / 1e3:10.1f} µs, "
+              f"mín {min(tempos) / 1e3:10.1f} µs")
+    baixo, alto = ajuste["intervalo"]
+    print(f"  expoente ajustado: {ajuste['expoente']:.3f} (IC {ajuste['confianca']:.0%}: {baixo:.3f} .. {alto:.3f})")
+
+
+if __name__ == "__main__":
+    tamanhos = [64, 128, 256, 512, 1024]
+
+    resultados_n = benchmark(funcao_O_n, tamanhos)
+    resultados_n2 = benchmark(funcao_O_n2, tamanhos, repeticoes=3)
+    ajuste_n = ajustar_expoente(resultados_n)
+    ajuste_n2 = ajustar_expoente(resultados_n2)
+
+    relatorio("O(n)", resultados_n, ajuste_n)
+    relatorio("O(n²)", resultados_n2, ajuste_n2)
+
+    # Uma versão O(n) com constante alta para ilustrar o cruzamento com O(n²)
+    def funcao_O_n_custosa(n):
+        return sum(funcao_O_n(40) for _ in range(n))
+
+    resultados_custosa = benchmark(funcao_O_n_custosa, tamanhos, repeticoes=3)
+    ajuste_custosa = ajustar_expoente(resultados_custosa)
+    relatorio("O(n) com constante alta", resultados_custosa, ajuste_custosa)
+
+    cruzamento = ponto_de_cruzamento(ajuste_custosa, ajuste_n2)
+    if cruzamento is None:
+        print("As curvas não se cruzam")
+    else:
+        print(f"Cruzamento estimado entre O(n) custosa e O(n²): n ≈ {cruzamento:.0f}")
@@ -0,0 +1,161 @@
+# Este código grava cada execução de benchmark em um arquivo JSON-lines (somente anexação),
+# identificando a função, o tamanho da entrada, a revisão do git e uma impressão digital da máquina.
+# O comando "comparar" aplica o teste de Mann-Whitney entre duas revisões para detectar lentidões
+# estatisticamente significativas em funções como funcao_O_n2.
+# Não são necessárias bibliotecas externas. Uso:
+#   python 20261018_184012_Historico_de_Benchmarks.py registrar
+#   python 20261018_184012_Historico_de_Benchmarks.py comparar <revisao_base> <revisao_nova>
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import time
+from collections import defaultdict
+
+ARQUIVO_PADRAO = "benchmarks.jsonl"
+
+
+def funcao_O_n(n):
+    soma = 0
+    for i in range(n):
+        soma += i
+    return soma
+
+
+def funcao_O_n2(n):
+    soma = 0
+    for i in range(n):
+        for j in range(n):
+            soma += i + j
+    return soma
+
+
+def revisao_git():
+    try:
+        saida = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                               capture_output=True, text=True, check=True)
+        return saida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecida"
+
+
+def impressao_digital_maquina():
+    # Resultados de máquinas diferentes não são comparáveis entre si
+    dados = "|".join([platform.machine(), platform.processor(), platform.python_implementation(),
+                      platform.python_version(), str(os.cpu_count())])
+    return hashlib.sha256(dados.encode()).hexdigest()[:12]
+
+
+def registrar(funcao, tamanhos, repeticoes=9, aquecimento=2, arquivo=ARQUIVO_PADRAO):
+    revisao = revisao_git()
+    maquina = impressao_digital_maquina()
+    with open(arquivo, "a", encoding="utf-8") as saida:
+        for n in tamanhos:
+            for _ in range(aquecimento):
+                funcao(n)
+            tempos = []
+            for _ in range(repeticoes):
+                inicio = time.perf_counter_ns()
+                funcao(n)
+                tempos.append(time.perf_counter_ns() - inicio)
+            registro = {
+                "funcao": funcao.__name__,
+                "tamanho": n,
+                "revisao": revisao,
+                "maquina": maquina,
+                "quando": time.time(),
+                "tempos_ns": tempos,
+            }
+            saida.write(json.dumps(registro) + "\n")
+    return revisao
+
+
+def carregar(arquivo=ARQUIVO_PADRAO):
+    # Agrupa as amostras por (função, tamanho, máquina) e revisão
+    amostras = defaultdict(lambda: defaultdict(list))
+    with open(arquivo, encoding="utf-8") as entrada:
+        for linha in entrada:
+            if not linha.strip():
+                continue
+            registro = json.loads(linha)
+            chave = (registro["funcao"], registro["tamanho"], registro["maquina"])
+            amostras[chave][registro["revisao"]].extend(registro["tempos_ns"])
+    return amostras
+
+
+def mann_whitney(a, b):
+    # Teste U bilateral com aproximação normal e correção para empates
+    combinados = sorted([(valor, 0) for valor in a] + [(valor, 1) for valor in b])
+    postos = [0.0] * len(combinados)
+    correcao_empates = 0
+    i = 0
+    while i < len(combinados):
+        j = i
+        while j + 1 < len(combinados) and combinados[j + 1][0] == combinados[i][0]:
+            j += 1
+        posto_medio = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            postos[k] = posto_medio
+        empatados = j - i + 1
+        correcao_empates += empatados ** 3 - empatados
+        i = j + 1
+
+    n1, n2 = len(a), len(b)
+    soma_postos_a = sum(posto for posto, (_, grupo) in zip(postos, combinados) if grupo == 0)
+    u = soma_postos_a - n1 * (n1 + 1) / 2
+    media = n1 * n2 / 2
+    n = n1 + n2
+    variancia = n1 * n2 / 12 * ((n + 1) - correcao_empates / (n * (n - 1)))
+    if variancia <= 0:
+        return u, 1.0
+    z = (u - media) / math.sqrt(variancia)
+    p_valor = 2 * (1 - statistics.NormalDist().cdf(abs(z)))
+    return u, p_valor
+
+
+def comparar(revisao_base, revisao_nova, alfa=0.01, arquivo=ARQUIVO_PADRAO):
+    lentidoes = []
+    for (funcao, tamanho, maquina), por_revisao in sorted(carregar(arquivo).items()):
+        base = por_revisao.get(revisao_base)
+        nova = por_revisao.get(revisao_nova)
+        if not base or not nova:
+            continue
+        _, p_valor = mann_whitney(base, nova)
+        razao = statistics.median(nova) / statistics.median(base)
+        status = "ok"
+        if p_valor < alfa and razao > 1:
+            status = "MAIS LENTA"
+            lentidoes.append((funcao, tamanho, maquina, razao, p_valor))
+        elif p_valor < alfa:
+            status = "mais rápida"
+        print(f"{funcao:>12} n={tamanho:<6} [{maquina}] razão {razao:6.3f}  p={p_valor:.4f}  {status}")
+    return lentidoes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Histórico de benchmarks com detecção de regressões")
+    parser.add_argument("--arquivo", default=ARQUIVO_PADRAO)
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    comandos.add_parser("registrar")
+    comparacao = comandos.add_parser("comparar")
+    comparacao.add_argument("revisao_base")
+    comparacao.add_argument("revisao_nova")
+    comparacao.add_argument("--alfa", type=float, default=0.01)
+    args = parser.parse_args()
+
+    if args.comando == "registrar":
+        tamanhos = [100, 200, 400]
+        registrar(funcao_O_n, tamanhos, arquivo=args.arquivo)
+        revisao = registrar(funcao_O_n2, tamanhos, arquivo=args.arquivo)
+        print(f"Resultados da revisão {revisao} gravados em {args.arquivo}")
+    else:
+        lentidoes = comparar(args.revisao_base, args.revisao_nova, args.alfa, args.arquivo)
+        if lentidoes:
+            print(f"{len(lentidoes)} regressão(ões) significativa(s) encontrada(s)")
+            raise SystemExit(1)
+        print("Nenhuma regressão significativa")
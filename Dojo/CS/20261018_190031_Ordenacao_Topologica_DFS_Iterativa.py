@@ -0,0 +1,68 @@
+# Este código implementa a ordenação topológica por busca em profundidade (DFS) sem recursão.
+# A versão recursiva estoura a pilha (RecursionError) em cadeias com mais de ~1000 vértices e devolve
+# uma ordem inválida quando há ciclo. Aqui usamos uma pilha explícita de iteradores e a coloração
+# branco/cinza/preto: encontrar um vértice cinza significa que existe um ciclo, que é devolvido como caminho.
+# Vizinhos que não são chaves do grafo são tratados como vértices sem saída, sem alterar o defaultdict.
+# Não são necessárias bibliotecas externas.
+
+import time
+from collections import defaultdict
+
+BRANCO, CINZA, PRETO = 0, 1, 2
+
+
+def topological_sort(graph):
+    # Retorna (ordem, None) para um DAG ou (None, ciclo) quando há ciclo
+    cor = {}
+    ordem = []
+    vazio = ()
+
+    for raiz in graph:
+        if cor.get(raiz, BRANCO) != BRANCO:
+            continue
+        cor[raiz] = CINZA
+        pilha = [(raiz, iter(graph.get(raiz, vazio)))]
+        while pilha:
+            node, vizinhos = pilha[-1]
+            for neighbor in vizinhos:
+                estado = cor.get(neighbor, BRANCO)
+                if estado == BRANCO:
+                    cor[neighbor] = CINZA
+                    pilha.append((neighbor, iter(graph.get(neighbor, vazio))))
+                    break
+                if estado == CINZA:
+                    # Os vértices cinza na pilha, a partir de neighbor, formam o ciclo
+                    caminho = [v for v, _ in pilha]
+                    ciclo = caminho[caminho.index(neighbor):]
+                    ciclo.append(neighbor)
+                    return None, ciclo
+            else:
+                # Todos os vizinhos foram processados
+                pilha.pop()
+                cor[node] = PRETO
+                ordem.append(node)
+
+    return ordem[::-1], None  # Retorna a ordem inversa de finalização
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    graph = defaultdict(list)
+    graph['A'].extend(['B', 'C'])
+    graph['B'].extend(['D'])
+    graph['C'].extend(['D'])
+
+    ordem, _ = topological_sort(graph)
+    print("Grafo de dependências:", dict(graph))
+    print("Ordenação topológica:", ordem)
+    print("Chaves do defaultdict após a ordenação:", list(graph))
+
+    graph['D'].append('B')
+    _, ciclo = topological_sort(graph)
+    print("Ciclo encontrado:", " -> ".join(ciclo))
+
+    # Uma cadeia de 1 milhão de vértices estouraria a versão recursiva
+    cadeia = {i: [i + 1] for i in range(1_000_000)}
+    inicio = time.perf_counter()
+    ordem, _ = topological_sort(cadeia)
+    print(f"Cadeia com {len(ordem)} vértices ordenada em {time.perf_counter() - inicio:.2f}s")
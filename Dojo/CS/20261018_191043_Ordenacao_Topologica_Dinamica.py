@@ -0,0 +1,164 @@
+# Este código mantém uma ordenação topológica de forma incremental usando o algoritmo de Pearce-Kelly.
+# Ao inserir uma aresta x -> y que viola a ordem atual, só a região afetada (vértices com posição entre
+# a de y e a de x, alcançáveis a partir deles) é visitada e reordenada, em vez de recalcular tudo em O(V+E).
+# Arestas que criariam um ciclo são rejeitadas, e a remoção de arestas nunca invalida a ordem.
+# O exemplo compara o custo por inserção com o recálculo completo (Kahn) em um grafo com 1 milhão de arestas.
+# Não são necessárias bibliotecas externas.
+
+import random
+import time
+from collections import deque
+
+
+class OrdemTopologicaDinamica:
+    def __init__(self):
+        self.sucessores = {}
+        self.predecessores = {}
+        self.posicao = {}            # vértice -> índice na ordem
+        self.vertice_na_posicao = []  # índice na ordem -> vértice
+
+    def adicionar_vertice(self, v):
+        if v not in self.posicao:
+            self.posicao[v] = len(self.vertice_na_posicao)
+            self.vertice_na_posicao.append(v)
+            self.sucessores[v] = set()
+            self.predecessores[v] = set()
+
+    def adicionar_aresta(self, x, y):
+        # Retorna False (e não insere a aresta) se ela criaria um ciclo
+        self.adicionar_vertice(x)
+        self.adicionar_vertice(y)
+        if x == y:
+            return False
+        if y in self.sucessores[x]:
+            return True
+
+        limite_inferior = self.posicao[y]
+        limite_superior = self.posicao[x]
+        if limite_inferior < limite_superior:
+            alcancaveis = self._busca_para_frente(y, limite_superior)
+            if alcancaveis is None:
+                return False
+            anteriores = self._busca_para_tras(x, limite_inferior)
+            self._reordenar(anteriores, alcancaveis)
+
+        self.sucessores[x].add(y)
+        self.predecessores[y].add(x)
+        return True
+
+    def remover_aresta(self, x, y):
+        # Remover uma aresta nunca torna a ordem atual inválida
+        self.sucessores.get(x, set()).discard(y)
+        self.predecessores.get(y, set()).discard(x)
+
+    def _busca_para_frente(self, inicio, limite_superior):
+        # Vértices alcançáveis a partir de y com posição até a de x; encontrar x significa ciclo
+        posicao = self.posicao
+        visitados = {inicio}
+        pilha = [inicio]
+        while pilha:
+            n = pilha.pop()
+            for w in self.sucessores[n]:
+                p = posicao[w]
+                if p == limite_superior:
+                    return None
+                if p < limite_superior and w not in visitados:
+                    visitados.add(w)
+                    pilha.append(w)
+        return visitados
+
+    def _busca_para_tras(self, inicio, limite_inferior):
+        # Vértices que alcançam x com posição a partir da de y
+        posicao = self.posicao
+        visitados = {inicio}
+        pilha = [inicio]
+        while pilha:
+            n = pilha.pop()
+            for w in self.predecessores[n]:
+                if posicao[w] > limite_inferior and w not in visitados:
+                    visitados.add(w)
+                    pilha.append(w)
+        return visitados
+
+    def _reordenar(self, anteriores, alcancaveis):
+        # Os ancestrais de x passam a ocupar as primeiras posições livres da região, depois os descendentes de y
+        posicao = self.posicao
+        anteriores = sorted(anteriores, key=posicao.__getitem__)
+        alcancaveis = sorted(alcancaveis, key=posicao.__getitem__)
+        posicoes_livres = sorted(posicao[v] for v in anteriores + alcancaveis)
+        for v, p in zip(anteriores + alcancaveis, posicoes_livres):
+            posicao[v] = p
+            self.vertice_na_posicao[p] = v
+
+    def ordem(self):
+        return list(self.vertice_na_posicao)
+
+
+def topological_sort(sucessores):
+    # Recálculo completo com o algoritmo de Kahn, usado como referência
+    in_degree = {u: 0 for u in sucessores}
+    for u in sucessores:
+        for v in sucessores[u]:
+            in_degree[v] += 1
+
+    queue = deque([u for u in in_degree if in_degree[u] == 0])
+    sorted_order = []
+    while queue:
+        u = queue.popleft()
+        sorted_order.append(u)
+        for v in sucessores[u]:
+            in_degree[v] -= 1
+            if in_degree[v] == 0:
+                queue.append(v)
+    return sorted_order
+
+
+def ordem_valida(dinamica):
+    posicao = dinamica.posicao
+    return all(posicao[u] < posicao[v] for u, vs in dinamica.sucessores.items() for v in vs)
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    pequena = OrdemTopologicaDinamica()
+    for x, y in [('A', 'C'), ('B', 'C'), ('B', 'D'), ('C', 'E'), ('D', 'F'), ('F', 'A')]:
+        pequena.adicionar_aresta(x, y)
+    print("Ordem após as inserções:", pequena.ordem())
+    print("Aresta E -> B aceita?", pequena.adicionar_aresta('E', 'B'))
+
+    num_vertices, num_arestas, num_alteracoes = 200_000, 1_000_000, 2_000
+    rng = random.Random(7)
+    grafo = OrdemTopologicaDinamica()
+    for v in range(num_vertices):
+        grafo.adicionar_vertice(v)
+
+    # Grafo base: arestas sempre de um id menor para um maior (compatível com a ordem inicial)
+    inicio = time.perf_counter()
+    while num_arestas > 0:
+        a = rng.randrange(num_vertices - 1)
+        b = min(num_vertices - 1, a + 1 + int(rng.expovariate(1 / 50)))
+        if b not in grafo.sucessores[a]:
+            grafo.adicionar_aresta(a, b)
+            num_arestas -= 1
+    print(f"Grafo base construído em {time.perf_counter() - inicio:.2f}s")
+
+    # Alterações locais que contrariam a ordem atual: a região afetada é pequena
+    inicio = time.perf_counter()
+    aceitas = rejeitadas = 0
+    for _ in range(num_alteracoes):
+        y = rng.randrange(num_vertices - 100)
+        x = y + rng.randrange(1, 100)
+        if grafo.adicionar_aresta(x, y):
+            aceitas += 1
+        else:
+            rejeitadas += 1
+        grafo.remover_aresta(x, y)
+    incremental = (time.perf_counter() - inicio) / num_alteracoes
+
+    inicio = time.perf_counter()
+    topological_sort(grafo.sucessores)
+    recalculo = time.perf_counter() - inicio
+
+    print(f"Arestas aceitas: {aceitas}, rejeitadas por ciclo: {rejeitadas}, ordem válida: {ordem_valida(grafo)}")
+    print(f"Incremental: {incremental * 1e6:.1f} µs por alteração")
+    print(f"Recálculo completo: {recalculo * 1e6:.1f} µs por alteração ({recalculo / incremental:.0f}x mais lento)")
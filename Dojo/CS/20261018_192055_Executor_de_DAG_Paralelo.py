@@ -0,0 +1,154 @@
+# Este código executa as tarefas de um grafo de dependências em paralelo, usando a ideia do algoritmo de Kahn:
+# uma tarefa é despachada assim que seu grau de entrada chega a zero, e entre as tarefas prontas tem prioridade
+# a que tem o maior caminho crítico restante (o caminho mais longo até o fim do grafo).
+# Funciona com qualquer Executor de concurrent.futures (threads ou processos) e relata o makespan,
+# a utilização de cada worker e o paralelismo ideal derivado da estrutura de níveis do grafo.
+# Não são necessárias bibliotecas externas.
+
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+
+
+def _executar_tarefa(tarefa):
+    # Função de módulo para poder ser serializada pelo ProcessPoolExecutor
+    inicio = time.monotonic()
+    resultado = tarefa()
+    fim = time.monotonic()
+    worker = f"{os.getpid()}:{threading.get_ident()}"
+    return resultado, worker, inicio, fim
+
+
+def vertices(graph):
+    todos = dict.fromkeys(graph)
+    for u in graph:
+        todos.update(dict.fromkeys(graph[u]))
+    return list(todos)
+
+
+def ordem_e_niveis(graph):
+    # Kahn por níveis: o nível de um vértice é o tamanho do maior caminho de uma raiz até ele
+    nos = vertices(graph)
+    in_degree = {u: 0 for u in nos}
+    for u in graph:
+        for v in graph[u]:
+            in_degree[v] += 1
+
+    nivel = {u: 0 for u in nos if in_degree[u] == 0}
+    ordem = list(nivel)
+    for u in ordem:
+        for v in graph.get(u, ()):
+            in_degree[v] -= 1
+            nivel[v] = max(nivel.get(v, 0), nivel[u] + 1)
+            if in_degree[v] == 0:
+                ordem.append(v)
+
+    if len(ordem) != len(nos):  # Verifica se há ciclo
+        raise ValueError("O grafo contém um ciclo, execução não é possível.")
+    return ordem, nivel
+
+
+def caminho_critico(graph, ordem, duracoes):
+    # Maior soma de durações de cada vértice até um sumidouro, calculada em ordem topológica inversa
+    restante = {}
+    for u in reversed(ordem):
+        sucessores = graph.get(u, ())
+        restante[u] = duracoes.get(u, 1.0) + max((restante[v] for v in sucessores), default=0.0)
+    return restante
+
+
+def executar_grafo(graph, tarefas, executor=None, duracoes=None):
+    # tarefas: dicionário vértice -> callable sem argumentos
+    # duracoes: estimativa de duração por vértice para calcular o caminho crítico (padrão 1 para todos)
+    duracoes = duracoes or {}
+    ordem, nivel = ordem_e_niveis(graph)
+    prioridade = caminho_critico(graph, ordem, duracoes)
+    desempate = {u: i for i, u in enumerate(ordem)}
+
+    in_degree = {u: 0 for u in ordem}
+    for u in graph:
+        for v in graph[u]:
+            in_degree[v] += 1
+
+    proprio_executor = executor is None
+    if proprio_executor:
+        executor = ThreadPoolExecutor()
+    workers = getattr(executor, "_max_workers", os.cpu_count())
+
+    prontos = [(-prioridade[u], desempate[u], u) for u in ordem if in_degree[u] == 0]
+    heapq.heapify(prontos)
+    em_execucao = {}
+    resultados = {}
+    ocupacao = {}
+    inicio_total = time.monotonic()
+
+    try:
+        while prontos or em_execucao:
+            # Mantém no máximo `workers` tarefas em voo para que a prioridade decida quem roda primeiro
+            while prontos and len(em_execucao) < workers:
+                _, _, u = heapq.heappop(prontos)
+                em_execucao[executor.submit(_executar_tarefa, tarefas[u])] = u
+
+            concluidas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in concluidas:
+                u = em_execucao.pop(futuro)
+                resultados[u], worker, inicio, fim = futuro.result()
+                ocupacao[worker] = ocupacao.get(worker, 0.0) + (fim - inicio)
+                for v in graph.get(u, ()):
+                    in_degree[v] -= 1
+                    if in_degree[v] == 0:
+                        heapq.heappush(prontos, (-prioridade[v], desempate[v], v))
+    finally:
+        if proprio_executor:
+            executor.shutdown()
+
+    makespan = time.monotonic() - inicio_total
+    largura_niveis = {}
+    for u in ordem:
+        largura_niveis[nivel[u]] = largura_niveis.get(nivel[u], 0) + 1
+    trabalho_total = sum(duracoes.get(u, 1.0) for u in ordem)
+    relatorio = {
+        "makespan": makespan,
+        "utilizacao": {w: ocupado / makespan for w, ocupado in ocupacao.items()},
+        "niveis": len(largura_niveis),
+        "largura_maxima": max(largura_niveis.values(), default=0),
+        "paralelismo_ideal": trabalho_total / max(prioridade.values(), default=1.0),
+    }
+    return resultados, relatorio
+
+
+def trabalho(nome, segundos):
+    # Simula uma tarefa de CPU ocupando o processador pelo tempo indicado
+    fim = time.monotonic() + segundos
+    contador = 0
+    while time.monotonic() < fim:
+        contador += 1
+    return f"{nome} concluída"
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    grafo = {
+        'A': ['C'],
+        'B': ['C', 'D'],
+        'C': ['E'],
+        'D': ['F'],
+        'E': [],
+        'F': []
+    }
+    duracoes = {'A': 0.2, 'B': 0.1, 'C': 0.3, 'D': 0.1, 'E': 0.2, 'F': 0.1}
+    tarefas = {no: partial(trabalho, no, segundos) for no, segundos in duracoes.items()}
+
+    for nome, executor in [("threads", ThreadPoolExecutor(max_workers=4)),
+                           ("processos", ProcessPoolExecutor(max_workers=4))]:
+        with executor:
+            resultados, relatorio = executar_grafo(grafo, tarefas, executor, duracoes)
+        print(f"Executor com {nome}: makespan {relatorio['makespan']:.2f}s "
+              f"(soma das tarefas {sum(duracoes.values()):.2f}s)")
+        print(f"  Níveis: {relatorio['niveis']}, largura máxima: {relatorio['largura_maxima']}, "
+              f"paralelismo ideal: {relatorio['paralelismo_ideal']:.2f}")
+        for worker, uso in sorted(relatorio["utilizacao"].items()):
+            print(f"  Worker {worker}: {uso:.0%} ocupado")
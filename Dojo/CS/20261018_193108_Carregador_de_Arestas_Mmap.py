@@ -0,0 +1,190 @@
+# Este código carrega grafos enormes a partir de arquivos de lista de arestas usando mmap, sem montar um
+# dicionário de listas. O formato binário é uma sequência de pares uint32 (origem, destino) em ordem nativa;
+# o formato texto tem uma aresta "origem destino" por linha. O arquivo é lido em blocos de tamanho fixo e cada
+# bloco é convertido de uma vez em um vetor NumPy (np.frombuffer no binário, o parser em C de np.fromstring no
+# texto), sem criar um objeto Python por aresta. O grafo é montado direto no formato CSR em três passadas
+# vetorizadas (maior vértice, graus com bincount, preenchimento com argsort estável). O pico de memória fica em
+# ~4 bytes por aresta mais alguns bytes por vértice e por bloco, e o resultado alimenta a ordenação de Kahn.
+# Para executar, é necessário instalar o NumPy: pip install numpy
+
+import mmap
+import os
+import random
+import tempfile
+import time
+from array import array
+
+import numpy as np
+
+TAMANHO_BLOCO = 1 << 22  # bytes lidos por bloco; no formato binário precisa ser múltiplo de 8 (um par)
+
+assert array('I').itemsize == 4, "o formato binário espera inteiros sem sinal de 4 bytes"
+
+
+class GrafoCSR:
+    def __init__(self, num_vertices, offsets, destinos):
+        self.num_vertices = num_vertices
+        self.offsets = offsets    # array('q') de tamanho num_vertices + 1
+        self.destinos = destinos  # array('I') com os destinos de todas as arestas
+
+    @property
+    def num_arestas(self):
+        return len(self.destinos)
+
+
+def blocos_binarios(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    # Gera (origens, destinos) de cada bloco; o bloco é copiado do mmap, então os vetores não prendem o mapa
+    if tamanho_bloco <= 0 or tamanho_bloco % 8:
+        raise ValueError(f"tamanho_bloco deve ser um múltiplo positivo de 8 bytes, não {tamanho_bloco}")
+    with open(caminho, "rb") as arquivo:
+        tamanho = os.fstat(arquivo.fileno()).st_size
+        if tamanho % 8:
+            raise ValueError(f"{caminho}: {tamanho} bytes não formam pares uint32 completos")
+        if tamanho == 0:
+            return
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            for inicio in range(0, tamanho, tamanho_bloco):
+                pares = np.frombuffer(mapa[inicio:inicio + tamanho_bloco], dtype=np.uint32)
+                yield pares[0::2], pares[1::2]
+
+
+def blocos_texto(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    # Corta cada bloco na última quebra de linha; o resto é levado para o próximo bloco
+    with open(caminho, "rb") as arquivo:
+        if os.fstat(arquivo.fileno()).st_size == 0:
+            return
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            inicio = 0
+            while inicio < len(mapa):
+                fim = min(inicio + tamanho_bloco, len(mapa))
+                if fim < len(mapa):
+                    quebra = mapa.rfind(b"\n", inicio, fim)
+                    fim = quebra + 1 if quebra >= inicio else fim
+                # Com sep=" ", qualquer sequência de espaços e quebras de linha separa os números
+                numeros = np.fromstring(mapa[inicio:fim], dtype=np.uint32, sep=" ")
+                if len(numeros) % 2:
+                    raise ValueError(f"{caminho}: linha sem destino perto do byte {fim}")
+                inicio = fim
+                yield numeros[0::2], numeros[1::2]
+
+
+def carregar_arestas(caminho, formato="binario", tamanho_bloco=TAMANHO_BLOCO):
+    blocos = blocos_binarios if formato == "binario" else blocos_texto
+
+    # 1ª passada: maior id de vértice
+    num_vertices = 0
+    for origens, destinos in blocos(caminho, tamanho_bloco):
+        if len(origens):
+            num_vertices = max(num_vertices, int(origens.max()) + 1, int(destinos.max()) + 1)
+
+    # 2ª passada: grau de saída de cada vértice, acumulado nos offsets
+    offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+    for origens, _ in blocos(caminho, tamanho_bloco):
+        offsets[1:] += np.bincount(origens, minlength=num_vertices)
+    np.cumsum(offsets, out=offsets)
+
+    # 3ª passada: preenche os destinos de cada vértice na sua faixa do CSR. No bloco, as arestas são
+    # agrupadas por origem (ordenação estável); a k-ésima aresta de u no bloco vai para posicao[u] + k
+    posicao = offsets[:-1].copy()
+    ordenados = np.empty(offsets[-1], dtype=np.uint32)
+    for origens, destinos in blocos(caminho, tamanho_bloco):
+        if not len(origens):
+            continue
+        ordem = np.argsort(origens, kind="stable")
+        agrupadas = origens[ordem]
+        inicios = np.flatnonzero(np.concatenate(([True], agrupadas[1:] != agrupadas[:-1])))
+        contagens = np.diff(np.append(inicios, len(agrupadas)))
+        rank = np.arange(len(agrupadas)) - np.repeat(inicios, contagens)
+        ordenados[posicao[agrupadas] + rank] = destinos[ordem]
+        posicao[agrupadas[inicios]] += contagens
+
+    # A ordenação percorre o grafo elemento a elemento, onde array é bem mais rápido que um vetor NumPy
+    offsets_csr, destinos_csr = array('q'), array('I')
+    offsets_csr.frombytes(memoryview(offsets).cast("B"))
+    destinos_csr.frombytes(memoryview(ordenados).cast("B"))
+    return GrafoCSR(num_vertices, offsets_csr, destinos_csr)
+
+
+def carregar_dicionario(caminho):
+    # Carregador ingênuo, só para comparação: um objeto Python por aresta e um dicionário de listas
+    grafo = {}
+    with open(caminho) as arquivo:
+        for linha in arquivo:
+            u, v = map(int, linha.split())
+            grafo.setdefault(u, []).append(v)
+    return grafo
+
+
+def topological_sort(grafo):
+    in_degree = array('I', [0]) * grafo.num_vertices
+    for v in grafo.destinos:
+        in_degree[v] += 1
+
+    offsets, destinos = grafo.offsets, grafo.destinos
+    sorted_order = array('I', (u for u in range(grafo.num_vertices) if in_degree[u] == 0))
+    inicio = 0
+    while inicio < len(sorted_order):
+        u = sorted_order[inicio]
+        inicio += 1
+        for i in range(offsets[u], offsets[u + 1]):
+            v = destinos[i]
+            in_degree[v] -= 1
+            if in_degree[v] == 0:
+                sorted_order.append(v)
+
+    if len(sorted_order) != grafo.num_vertices:  # Verifica se há ciclo
+        return "O grafo contém um ciclo, ordenação não é possível."
+    return sorted_order
+
+
+def gerar_arquivo_binario(caminho, num_vertices, num_arestas, semente=42):
+    # DAG aleatório gravado em blocos, sem manter todas as arestas na memória
+    rng = random.Random(semente)
+    with open(caminho, "wb") as arquivo:
+        restantes = num_arestas
+        while restantes:
+            bloco = array('I')
+            for _ in range(min(restantes, 1 << 18)):
+                a = rng.randrange(num_vertices - 1)
+                bloco.append(a)
+                bloco.append(rng.randrange(a + 1, num_vertices))
+            bloco.tofile(arquivo)
+            restantes -= len(bloco) // 2
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho_texto = os.path.join(pasta, "arestas.txt")
+        with open(caminho_texto, "w") as arquivo:
+            arquivo.write("0 2\n1 2\n1 3\n2 4\n3 5\n")
+        grafo = carregar_arestas(caminho_texto, formato="texto")
+        print("Ordenação topológica (texto):", list(topological_sort(grafo)))
+
+        caminho_binario = os.path.join(pasta, "arestas.bin")
+        gerar_arquivo_binario(caminho_binario, 500_000, 2_000_000)
+        tamanho = os.path.getsize(caminho_binario)
+
+        inicio = time.perf_counter()
+        grafo = carregar_arestas(caminho_binario)
+        carga = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        ordem = topological_sort(grafo)
+        ordenacao = time.perf_counter() - inicio
+
+        print(f"Arquivo binário de {tamanho / 2**20:.1f} MiB: {grafo.num_arestas} arestas carregadas em "
+              f"{carga:.2f}s ({tamanho / 2**20 / carga:.1f} MiB/s)")
+        print(f"Ordenação topológica de {len(ordem)} vértices em {ordenacao:.2f}s")
+
+        # Mesmo grafo em texto: o carregador por blocos contra o dicionário de listas
+        caminho_grande = os.path.join(pasta, "arestas_grande.txt")
+        with open(caminho_binario, "rb") as origem, open(caminho_grande, "w") as destino:
+            pares = np.fromfile(origem, dtype=np.uint32).reshape(-1, 2)
+            np.savetxt(destino, pares, fmt="%d")
+        tamanho = os.path.getsize(caminho_grande)
+        for nome, carregar in (("blocos + NumPy", lambda c: carregar_arestas(c, formato="texto")),
+                               ("dicionário de listas", carregar_dicionario)):
+            inicio = time.perf_counter()
+            carregar(caminho_grande)
+            duracao = time.perf_counter() - inicio
+            print(f"Texto de {tamanho / 2**20:.1f} MiB, {nome}: {duracao:.2f}s ({tamanho / 2**20 / duracao:.1f} MiB/s)")
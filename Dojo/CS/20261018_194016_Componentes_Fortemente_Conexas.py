@@ -0,0 +1,125 @@
+# Este código decompõe um grafo direcionado em componentes fortemente conexas (SCCs) com o algoritmo de Tarjan,
+# em versão iterativa (sem recursão), linear e baseada em arrays de inteiros.
+# Em vez de falhar quando há ciclo, a ordenação topológica devolve a ordem do grafo de condensação:
+# cada SCC vira uma única unidade, e as SCCs com mais de um vértice são exatamente os ciclos a quebrar.
+# Não são necessárias bibliotecas externas.
+
+import random
+import time
+from array import array
+
+
+def internar(graph):
+    # Converte o dicionário em ids inteiros e arrays CSR (offsets, destinos)
+    indice = {}
+    rotulos = []
+    for u in graph:
+        for w in (u, *graph[u]):
+            if w not in indice:
+                indice[w] = len(rotulos)
+                rotulos.append(w)
+
+    offsets = array('q', [0]) * (len(rotulos) + 1)
+    for u in graph:
+        offsets[indice[u] + 1] = len(graph[u])
+    for i in range(len(rotulos)):
+        offsets[i + 1] += offsets[i]
+
+    destinos = array('i', [0]) * offsets[-1]
+    for u in graph:
+        posicao = offsets[indice[u]]
+        for v in graph[u]:
+            destinos[posicao] = indice[v]
+            posicao += 1
+    return rotulos, offsets, destinos
+
+
+def tarjan(num_vertices, offsets, destinos):
+    # Retorna (num_componentes, componente de cada vértice); as componentes saem em ordem topológica inversa
+    NAO_VISITADO = -1
+    ordem_visita = array('i', [NAO_VISITADO]) * num_vertices
+    lowlink = array('i', [0]) * num_vertices
+    componente = array('i', [-1]) * num_vertices
+    na_pilha = bytearray(num_vertices)
+    pilha_scc = array('i')
+    proxima_aresta = array('q', offsets[:-1])  # posição do próximo vizinho a visitar
+    contador = 0
+    num_componentes = 0
+
+    for raiz in range(num_vertices):
+        if ordem_visita[raiz] != NAO_VISITADO:
+            continue
+        chamadas = array('i', [raiz])
+        ordem_visita[raiz] = lowlink[raiz] = contador
+        contador += 1
+        pilha_scc.append(raiz)
+        na_pilha[raiz] = 1
+
+        while chamadas:
+            v = chamadas[-1]
+            if proxima_aresta[v] < offsets[v + 1]:
+                w = destinos[proxima_aresta[v]]
+                proxima_aresta[v] += 1
+                if ordem_visita[w] == NAO_VISITADO:
+                    ordem_visita[w] = lowlink[w] = contador
+                    contador += 1
+                    pilha_scc.append(w)
+                    na_pilha[w] = 1
+                    chamadas.append(w)
+                elif na_pilha[w] and ordem_visita[w] < lowlink[v]:
+                    lowlink[v] = ordem_visita[w]
+                continue
+
+            # Todos os vizinhos de v foram visitados: "retorna" da chamada
+            chamadas.pop()
+            if chamadas and lowlink[v] < lowlink[chamadas[-1]]:
+                lowlink[chamadas[-1]] = lowlink[v]
+            if lowlink[v] == ordem_visita[v]:
+                while True:
+                    w = pilha_scc.pop()
+                    na_pilha[w] = 0
+                    componente[w] = num_componentes
+                    if w == v:
+                        break
+                num_componentes += 1
+
+    return num_componentes, componente
+
+
+def componentes_fortemente_conexas(graph):
+    rotulos, offsets, destinos = internar(graph)
+    num_componentes, componente = tarjan(len(rotulos), offsets, destinos)
+    grupos = [[] for _ in range(num_componentes)]
+    for u, c in enumerate(componente):
+        grupos[c].append(rotulos[u])
+    return grupos
+
+
+def topological_sort(graph):
+    # Ordem do grafo de condensação: lista de SCCs, cada uma como lista de rótulos
+    return componentes_fortemente_conexas(graph)[::-1]
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    grafo = {
+        'A': ['C'],
+        'B': ['C', 'D'],
+        'C': ['E'],
+        'D': ['F'],
+        'E': ['C'],  # ciclo C -> E -> C
+        'F': []
+    }
+    ordem = topological_sort(grafo)
+    print("Ordenação Topológica (condensação):", ordem)
+    print("Ciclos a quebrar:", [scc for scc in ordem if len(scc) > 1])
+
+    # Grafo grande com ciclos locais: cadeias de 10 vértices fechadas em anel, ligadas em sequência
+    num_vertices = 1_000_000
+    grande = {i: [i + 1] if i % 10 != 9 else [i - 9, min(i + 1, num_vertices - 1)] for i in range(num_vertices)}
+    for _ in range(num_vertices):
+        a = random.randrange(num_vertices - 10)
+        grande[a].append(a + 10)
+    inicio = time.perf_counter()
+    ordem = topological_sort(grande)
+    print(f"{num_vertices} vértices condensados em {len(ordem)} SCCs em {time.perf_counter() - inicio:.2f}s")
@@ -3,8 +3,16 @@
 # Para executar, não são necessárias bibliotecas externas. 
 # O código utiliza apenas a biblioteca padrão do Python.
 
+import importlib.util
 import random
-import hashlib
+from pathlib import Path
+
+# Carregado pelo caminho do arquivo: o nome começa com dígitos e o script pode rodar de qualquer diretório
+_especificacao = importlib.util.spec_from_file_location(
+    "provedores_de_hash", Path(__file__).parent / "20261018_211036_Provedores_de_Hash.py")
+_provedores = importlib.util.module_from_spec(_especificacao)
+_especificacao.loader.exec_module(_provedores)
+HASH = _provedores.provedor_configurado()
 
 def gerar_pseudonimo(seed):
     random.seed(seed)
@@ -15,7 +23,7 @@ def gerar_pseudonimo(seed):
     adjetivo = random.choice(adjetivos)
     pseudonimo = f"{adjetivo} {nome}"
     
-    avatar = hashlib.sha256(seed.encode()).hexdigest()[:8]  # Gera um hash e pega os primeiros 8 caracteres
+    avatar = HASH(seed.encode()).digest()[:4].hex()  # Gera um hash e pega os primeiros 4 bytes (8 caracteres)
     
     return pseudonimo, avatar
 
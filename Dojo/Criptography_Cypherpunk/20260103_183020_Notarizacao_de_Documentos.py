@@ -3,8 +3,17 @@
 # Isso garante a integridade e a imutabilidade dos registros. 
 # Para executar, não são necessárias bibliotecas externas.
 
-import hashlib
+import importlib.util
+import struct
 import time
+from pathlib import Path
+
+# Carregado pelo caminho do arquivo: o nome começa com dígitos e o script pode rodar de qualquer diretório
+_especificacao = importlib.util.spec_from_file_location(
+    "provedores_de_hash", Path(__file__).parent / "20261018_211036_Provedores_de_Hash.py")
+_provedores = importlib.util.module_from_spec(_especificacao)
+_especificacao.loader.exec_module(_provedores)
+HASH = _provedores.provedor_configurado()
 
 class Bloco:
     def __init__(self, indice, hash_documento, hash_anterior):
@@ -15,23 +24,24 @@ class Bloco:
         self.hash = self.calcular_hash()
 
     def calcular_hash(self):
-        valor = f"{self.indice}{self.hash_documento}{self.hash_anterior}{self.timestamp}"
-        return hashlib.sha256(valor.encode()).hexdigest()
+        # Hashes em bytes brutos; o bloco gênese não tem documento e seu anterior são 32 bytes zero
+        valor = struct.pack(">Qd", self.indice, self.timestamp) + (self.hash_documento or b"") + self.hash_anterior
+        return HASH(valor).digest()
 
 class Blockchain:
     def __init__(self):
         self.cadeia = []
-        self.criar_bloco(genesis=True)
+        self.criar_bloco()
 
     def criar_bloco(self, hash_documento=None):
         indice = len(self.cadeia) + 1
-        hash_anterior = self.cadeia[-1].hash if self.cadeia else "0"
+        hash_anterior = self.cadeia[-1].hash if self.cadeia else bytes(32)
         novo_bloco = Bloco(indice, hash_documento, hash_anterior)
         self.cadeia.append(novo_bloco)
         return novo_bloco
 
     def notarizar_documento(self, documento):
-        hash_documento = hashlib.sha256(documento.encode()).hexdigest()
+        hash_documento = HASH(documento.encode()).digest()
         bloco = self.criar_bloco(hash_documento)
         return bloco.hash
 
@@ -39,5 +49,5 @@ class Blockchain:
 blockchain = Blockchain()
 documento = "Este é um documento importante."
 hash_notarizado = blockchain.notarizar_documento(documento)
-print(f"Hash do documento notarizado: {hash_notarizado}")
+print(f"Hash do documento notarizado: {hash_notarizado.hex()}")
 print(f"Número de blocos na blockchain: {len(blockchain.cadeia)}")
\ No newline at end of file
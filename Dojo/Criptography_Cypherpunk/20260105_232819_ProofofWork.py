@@ -4,18 +4,27 @@
 # Para rodar este código, certifique-se de ter o Python instalado.
 # Não são necessárias bibliotecas externas.
 
-import hashlib
+import importlib.util
 import time
+from pathlib import Path
+
+# Carregado pelo caminho do arquivo: o nome começa com dígitos e o script pode rodar de qualquer diretório
+_especificacao = importlib.util.spec_from_file_location(
+    "provedores_de_hash", Path(__file__).parent / "20261018_211036_Provedores_de_Hash.py")
+_provedores = importlib.util.module_from_spec(_especificacao)
+_especificacao.loader.exec_module(_provedores)
+HASH = _provedores.provedor_configurado()
 
 def hashcash(header, nonce):
-    return hashlib.sha256(f"{header}{nonce}".encode()).hexdigest()
+    return HASH(f"{header}{nonce}".encode()).digest()
 
 def proof_of_work(header, difficulty):
     nonce = 0
-    prefix_str = '0' * difficulty
+    # "difficulty" zeros hexadecimais iniciais = 4 * difficulty bits zero no digest bruto
+    limite = 1 << (8 * HASH().digest_size - 4 * difficulty)
     while True:
         hash_result = hashcash(header, nonce)
-        if hash_result.startswith(prefix_str):
+        if int.from_bytes(hash_result, "big") < limite:
             return nonce, hash_result
         nonce += 1
 
@@ -27,5 +36,5 @@ if __name__ == "__main__":
     end_time = time.time()
     
     print(f"Nonce encontrado: {nonce}")
-    print(f"Hash resultante: {result_hash}")
+    print(f"Hash resultante: {result_hash.hex()}")
     print(f"Tempo de execução: {end_time - start_time:.2f} segundos")
\ No newline at end of file
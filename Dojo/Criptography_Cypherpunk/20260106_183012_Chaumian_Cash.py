@@ -2,8 +2,16 @@
 # Ele gera uma nota digital, a assina e valida a assinatura sem revelar a identidade do portador. 
 # Para executar, não são necessárias bibliotecas externas, apenas o Python padrão.
 
-import hashlib
+import importlib.util
 import random
+from pathlib import Path
+
+# Carregado pelo caminho do arquivo: o nome começa com dígitos e o script pode rodar de qualquer diretório
+_especificacao = importlib.util.spec_from_file_location(
+    "provedores_de_hash", Path(__file__).parent / "20261018_211036_Provedores_de_Hash.py")
+_provedores = importlib.util.module_from_spec(_especificacao)
+_especificacao.loader.exec_module(_provedores)
+HASH = _provedores.provedor_configurado()
 
 class DigitalNote:
     def __init__(self, value):
@@ -13,7 +21,7 @@ class DigitalNote:
 
     def sign(self):
         # Simula a assinatura da nota digital
-        return hashlib.sha256(f"{self.value}{self.serial_number}".encode()).hexdigest()
+        return HASH(f"{self.value}{self.serial_number}".encode()).digest()
 
     def validate(self, signature):
         # Valida a assinatura da nota digital
@@ -23,7 +31,7 @@ class DigitalNote:
 note = DigitalNote(100)
 
 # Exibindo informações da nota digital
-print(f"Nota Digital: {note.value}, Serial: {note.serial_number}, Assinatura: {note.signature}")
+print(f"Nota Digital: {note.value}, Serial: {note.serial_number}, Assinatura: {note.signature.hex()}")
 
 # Validando a assinatura
 is_valid = note.validate(note.signature)
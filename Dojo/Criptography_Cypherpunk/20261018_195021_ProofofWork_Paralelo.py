@@ -0,0 +1,104 @@
+# Este código paraleliza a busca de nonce do Proof-of-Work (Hashcash) entre vários processos.
+# O espaço de nonces é dividido em blocos de tamanho fixo distribuídos de forma intercalada entre os workers
+# (o worker w fica com os blocos w, w + W, w + 2W, ...). Assim que um worker encontra uma solução, os demais
+# param. No modo determinístico, o resultado é sempre o menor nonce válido, igual ao da versão serial.
+# Também é relatada a taxa agregada de hashes por segundo.
+# Não são necessárias bibliotecas externas.
+
+import hashlib
+import multiprocessing as mp
+import os
+import time
+
+NENHUM = -1
+VERIFICAR_A_CADA = 4096  # nonces entre consultas ao valor compartilhado
+
+
+def hashcash(header, nonce):
+    return hashlib.sha256(f"{header}{nonce}".encode()).hexdigest()
+
+
+def proof_of_work(header, difficulty):
+    nonce = 0
+    prefix_str = '0' * difficulty
+    while True:
+        hash_result = hashcash(header, nonce)
+        if hash_result.startswith(prefix_str):
+            return nonce, hash_result
+        nonce += 1
+
+
+def _varrer(header, prefix_str, inicio, fim):
+    # Retorna (nonce encontrado ou None, número de hashes calculados)
+    for nonce in range(inicio, fim):
+        if hashcash(header, nonce).startswith(prefix_str):
+            return nonce, nonce - inicio + 1
+    return None, fim - inicio
+
+
+def _minerar(header, difficulty, worker, num_workers, tamanho_bloco, menor, total_hashes, deterministico):
+    prefix_str = '0' * difficulty
+    hashes = 0
+    bloco = worker
+    parar = False
+    while not parar:
+        inicio = bloco * tamanho_bloco
+        fim_bloco = inicio + tamanho_bloco
+        for base in range(inicio, fim_bloco, VERIFICAR_A_CADA):
+            with menor.get_lock():
+                atual = menor.value
+            # Trechos depois da melhor solução conhecida não podem conter uma menor
+            if atual != NENHUM and (not deterministico or base > atual):
+                parar = True
+                break
+            encontrado, calculados = _varrer(header, prefix_str, base, min(base + VERIFICAR_A_CADA, fim_bloco))
+            hashes += calculados
+            if encontrado is not None:
+                with menor.get_lock():
+                    if menor.value == NENHUM or encontrado < menor.value:
+                        menor.value = encontrado
+                parar = True
+                break
+        bloco += num_workers
+
+    with total_hashes.get_lock():
+        total_hashes.value += hashes
+
+
+def proof_of_work_paralelo(header, difficulty, num_workers=None, tamanho_bloco=1 << 16, deterministico=True):
+    # Retorna (nonce, hash, hashes por segundo)
+    num_workers = num_workers or os.cpu_count()
+    menor = mp.Value('q', NENHUM)
+    total_hashes = mp.Value('q', 0)
+    processos = [
+        mp.Process(target=_minerar, args=(header, difficulty, w, num_workers, tamanho_bloco,
+                                          menor, total_hashes, deterministico))
+        for w in range(num_workers)
+    ]
+    inicio = time.perf_counter()
+    for p in processos:
+        p.start()
+    for p in processos:
+        p.join()
+    duracao = time.perf_counter() - inicio
+
+    nonce = menor.value
+    return nonce, hashcash(header, nonce), total_hashes.value / duracao
+
+
+if __name__ == "__main__":
+    header = "Exemplo de Hashcash"
+    difficulty = 5  # Número de zeros iniciais desejados
+
+    start_time = time.time()
+    nonce_serial, _ = proof_of_work(header, difficulty)
+    tempo_serial = time.time() - start_time
+    print(f"Serial: nonce {nonce_serial} em {tempo_serial:.2f} segundos")
+
+    start_time = time.time()
+    nonce, result_hash, taxa = proof_of_work_paralelo(header, difficulty)
+    tempo_paralelo = time.time() - start_time
+    print(f"Paralelo ({os.cpu_count()} processos): nonce {nonce} em {tempo_paralelo:.2f} segundos")
+    print(f"Hash resultante: {result_hash}")
+    print(f"Taxa agregada: {taxa / 1e6:.2f} MH/s")
+    print(f"Mesmo nonce da versão serial: {nonce == nonce_serial}")
@@ -0,0 +1,97 @@
+# Este código otimiza o laço de mineração do Hashcash sem mudar o resultado da versão original.
+# O cabeçalho é processado pelo SHA-256 uma única vez (midstate) e, para cada nonce, só o estado é copiado
+# com .copy(). Os dígitos altos do nonce também entram no midstate, uma vez a cada 1000 nonces, e os três
+# últimos dígitos vêm de uma tabela de bytes pré-calculada, sem f-strings nem encode() no laço.
+# A dificuldade é testada nos bytes brutos do digest em vez da string hexadecimal.
+# Um benchmark embutido compara os hashes por segundo com o proof_of_work atual.
+# Não são necessárias bibliotecas externas.
+
+import hashlib
+import time
+
+
+def hashcash(header, nonce):
+    return hashlib.sha256(f"{header}{nonce}".encode()).hexdigest()
+
+
+def proof_of_work(header, difficulty):
+    nonce = 0
+    prefix_str = '0' * difficulty
+    while True:
+        hash_result = hashcash(header, nonce)
+        if hash_result.startswith(prefix_str):
+            return nonce, hash_result
+        nonce += 1
+
+
+# Os três últimos dígitos decimais do nonce vêm de tabelas pré-calculadas; o restante entra no midstate
+TAMANHO_BLOCO = 1000
+SUFIXOS = [b"%03d" % i for i in range(TAMANHO_BLOCO)]          # nonces >= 1000: "000".."999"
+SEM_PREFIXO = [b"%d" % i for i in range(TAMANHO_BLOCO)]        # nonces < 1000: "0".."999"
+
+
+def proof_of_work_otimizado(header, difficulty, nonce_inicial=0, limite=None):
+    # Retorna (nonce, hash) ou None se `limite` nonces foram testados sem sucesso
+    midstate = hashlib.sha256(header.encode())
+    bytes_zero = bytes(difficulty // 2)  # cada byte zero equivale a dois dígitos hexadecimais
+    completos = len(bytes_zero)
+    meio_byte = difficulty % 2 == 1      # dificuldade ímpar exige também o nibble alto zerado
+
+    nonce = nonce_inicial
+    fim = nonce_inicial + limite if limite is not None else None
+    while fim is None or nonce < fim:
+        prefixo, resto = divmod(nonce, TAMANHO_BLOCO)
+        if prefixo == 0:
+            estado, sufixos = midstate, SEM_PREFIXO
+        else:
+            # O prefixo do nonce é absorvido uma vez por bloco de 1000 nonces
+            estado, sufixos = midstate.copy(), SUFIXOS
+            estado.update(b"%d" % prefixo)
+        ultimo = TAMANHO_BLOCO if fim is None else min(TAMANHO_BLOCO, fim - prefixo * TAMANHO_BLOCO)
+
+        copiar = estado.copy
+        for i in range(resto, ultimo):
+            h = copiar()
+            h.update(sufixos[i])
+            digest = h.digest()
+            if digest.startswith(bytes_zero) and (not meio_byte or digest[completos] < 16):
+                return prefixo * TAMANHO_BLOCO + i, digest.hex()
+        nonce = prefixo * TAMANHO_BLOCO + ultimo
+    return None
+
+
+def benchmark(header="Exemplo de Hashcash", num_hashes=300_000):
+    # Dificuldade impossível para medir só a vazão de cada laço
+    impossivel = 64
+    prefix_str = '0' * impossivel
+
+    inicio = time.perf_counter()
+    for nonce in range(num_hashes):
+        hashcash(header, nonce).startswith(prefix_str)
+    original = num_hashes / (time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    proof_of_work_otimizado(header, impossivel, limite=num_hashes)
+    otimizado = num_hashes / (time.perf_counter() - inicio)
+    return original, otimizado
+
+
+if __name__ == "__main__":
+    header = "Exemplo de Hashcash"
+    difficulty = 5  # Número de zeros iniciais desejados
+
+    start_time = time.time()
+    nonce_original, _ = proof_of_work(header, difficulty)
+    tempo_original = time.time() - start_time
+
+    start_time = time.time()
+    nonce, result_hash = proof_of_work_otimizado(header, difficulty)
+    tempo_otimizado = time.time() - start_time
+
+    print(f"Nonce encontrado: {nonce} (original: {nonce_original})")
+    print(f"Hash resultante: {result_hash}")
+    print(f"Tempo de execução: original {tempo_original:.2f}s, otimizado {tempo_otimizado:.2f}s")
+
+    original, otimizado = benchmark()
+    print(f"Vazão: original {original / 1e6:.2f} MH/s, otimizado {otimizado / 1e6:.2f} MH/s "
+          f"({otimizado / original:.2f}x)")
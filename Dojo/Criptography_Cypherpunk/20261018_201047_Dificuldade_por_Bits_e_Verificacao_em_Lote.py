@@ -0,0 +1,102 @@
+# Este código expressa a dificuldade do Proof-of-Work como um alvo inteiro de 256 bits: uma prova é válida
+# quando o SHA-256 de (header, nonce), lido como inteiro big-endian, é menor que o alvo. Isso permite
+# ajustar o trabalho em frações de bit, em vez de saltos de 16x por dígito hexadecimal.
+# Também inclui um verificador em lote que checa milhares de submissões de uma vez, comparando os digests
+# brutos com o alvo em bytes, e um cache LRU das provas já aceitas para rejeitar replays em O(1).
+# Não são necessárias bibliotecas externas.
+
+import hashlib
+import time
+from collections import OrderedDict
+
+ALVO_MAXIMO = 1 << 256
+
+
+def hashcash(header, nonce):
+    return hashlib.sha256(f"{header}{nonce}".encode()).digest()
+
+
+def bits_zero_iniciais(digest):
+    return len(digest) * 8 - int.from_bytes(digest, "big").bit_length()
+
+
+def alvo_para_bits(bits):
+    # Dificuldade fracionária: bits=20.5 exige em média 2**20.5 tentativas
+    return min(ALVO_MAXIMO - 1, int(ALVO_MAXIMO / 2 ** bits))
+
+
+def proof_of_work(header, alvo):
+    alvo_bytes = alvo.to_bytes(32, "big")
+    nonce = 0
+    while True:
+        digest = hashcash(header, nonce)
+        # Para bytes de mesmo tamanho, a comparação lexicográfica equivale à comparação numérica big-endian
+        if digest < alvo_bytes:
+            return nonce, digest.hex()
+        nonce += 1
+
+
+class VerificadorDeProvas:
+    def __init__(self, alvo, capacidade_cache=100_000):
+        self.alvo_bytes = alvo.to_bytes(32, "big")
+        self.capacidade_cache = capacidade_cache
+        # digest -> None, em ordem de uso. A chave é o digest, não (header, nonce): ("cliente-1", 635) e
+        # ("cliente-16", 35) geram a mesma mensagem e portanto são a mesma prova
+        self.recentes = OrderedDict()
+
+    def _ja_visto(self, chave):
+        if chave in self.recentes:
+            self.recentes.move_to_end(chave)
+            return True
+        return False
+
+    def _lembrar(self, chave):
+        self.recentes[chave] = None
+        if len(self.recentes) > self.capacidade_cache:
+            self.recentes.popitem(last=False)
+
+    def verificar(self, header, nonce):
+        return self.verificar_lote([(header, nonce)])[0]
+
+    def verificar_lote(self, submissoes):
+        # Retorna uma lista de booleanos na mesma ordem das submissões
+        alvo_bytes = self.alvo_bytes
+        sha256 = hashlib.sha256
+        resultados = []
+        for header, nonce in submissoes:
+            # Só nonces inteiros: "635" e 635 também gerariam a mesma mensagem
+            if type(nonce) is not int or nonce < 0:
+                resultados.append(False)
+                continue
+            digest = sha256(f"{header}{nonce}".encode()).digest()
+            if self._ja_visto(digest):
+                resultados.append(False)  # replay de uma prova já aceita
+                continue
+            valida = digest < alvo_bytes
+            if valida:
+                self._lembrar(digest)
+            resultados.append(valida)
+        return resultados
+
+
+if __name__ == "__main__":
+    header = "Exemplo de Hashcash"
+    for bits in (12, 14, 14.5, 20):
+        alvo = alvo_para_bits(bits)
+        start_time = time.time()
+        nonce, result_hash = proof_of_work(header, alvo)
+        print(f"Dificuldade {bits:>4} bits: nonce {nonce}, {bits_zero_iniciais(bytes.fromhex(result_hash))} bits "
+              f"zero iniciais, {time.time() - start_time:.2f} segundos")
+
+    # Verificação em lote: provas válidas de vários headers, algumas inválidas e alguns replays
+    alvo = alvo_para_bits(8)
+    submissoes = [(f"cliente-{i}", proof_of_work(f"cliente-{i}", alvo)[0]) for i in range(5000)]
+    submissoes += [(f"cliente-{i}", 10**9 + i) for i in range(1000)]  # nonces arbitrários, quase sempre inválidos
+    submissoes += submissoes[:2000]  # replays
+
+    verificador = VerificadorDeProvas(alvo)
+    start_time = time.perf_counter()
+    resultados = verificador.verificar_lote(submissoes)
+    duracao = time.perf_counter() - start_time
+    print(f"{len(submissoes)} submissões verificadas em {duracao * 1e3:.1f} ms "
+          f"({len(submissoes) / duracao:,.0f} por segundo): {sum(resultados)} aceitas")
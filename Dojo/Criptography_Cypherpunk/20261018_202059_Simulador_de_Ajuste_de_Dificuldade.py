@@ -0,0 +1,95 @@
+# Este código simula uma rede de mineradores Hashcash com taxas de hash diferentes para avaliar algoritmos de
+# ajuste de dificuldade, sem minerar de verdade. Com dificuldade D (número esperado de hashes por bloco) e
+# taxa total H, o tempo até o próximo bloco segue uma distribuição exponencial de média D / H, e o vencedor é
+# sorteado proporcionalmente à taxa de cada minerador. Tudo é vetorizado com NumPy sobre milhares de
+# simulações independentes, o que permite repetir milhares de janelas de ajuste por segundo.
+# Para executar, instale o NumPy com: pip install numpy
+
+import time
+
+import numpy as np
+
+
+class RetargetJanela:
+    # Ajuste a cada `janela` blocos pela razão entre o tempo esperado e o tempo observado (estilo Bitcoin)
+    def __init__(self, janela=2016, fator_maximo=4.0):
+        self.tamanho_passo = janela
+        self.fator_maximo = fator_maximo
+
+    def ajustar(self, dificuldade, tempos, tempo_alvo):
+        razao = tempo_alvo * tempos.shape[1] / tempos.sum(axis=1)
+        return dificuldade * np.clip(razao, 1 / self.fator_maximo, self.fator_maximo)
+
+
+class RetargetEMA:
+    # Ajuste a cada bloco: o log da dificuldade acompanha uma média móvel exponencial do erro do tempo de bloco
+    def __init__(self, alfa=1 / 144):
+        self.tamanho_passo = 1
+        self.alfa = alfa
+
+    def ajustar(self, dificuldade, tempos, tempo_alvo):
+        erro = (tempos[:, 0] - tempo_alvo) / tempo_alvo
+        return dificuldade * np.exp(-self.alfa * erro)
+
+
+def simular(algoritmo, taxas_mineradores, perfil_taxa, tempo_alvo=600.0, num_simulacoes=1000, semente=0):
+    # taxas_mineradores: hashes/s de cada minerador; perfil_taxa: multiplicador da taxa total em cada bloco
+    # Retorna (tempos de bloco com forma (simulações, blocos), blocos ganhos por minerador)
+    rng = np.random.default_rng(semente)
+    taxas_mineradores = np.asarray(taxas_mineradores, dtype=float)
+    perfil_taxa = np.asarray(perfil_taxa, dtype=float)
+    num_blocos = len(perfil_taxa)
+    taxa_total = taxas_mineradores.sum()
+
+    dificuldade = np.full(num_simulacoes, taxa_total * perfil_taxa[0] * tempo_alvo)
+    tempos = np.empty((num_simulacoes, num_blocos))
+    passo = algoritmo.tamanho_passo
+    for inicio in range(0, num_blocos, passo):
+        fim = min(inicio + passo, num_blocos)
+        taxa = taxa_total * perfil_taxa[inicio:fim]
+        # Exponencial de média D / H para cada simulação e cada bloco do passo
+        tempos[:, inicio:fim] = rng.exponential(size=(num_simulacoes, fim - inicio)) * (dificuldade[:, None] / taxa)
+        dificuldade = algoritmo.ajustar(dificuldade, tempos[:, inicio:fim], tempo_alvo)
+
+    vencedores = rng.choice(len(taxas_mineradores), size=num_simulacoes * num_blocos,
+                            p=taxas_mineradores / taxa_total)
+    blocos_ganhos = np.bincount(vencedores, minlength=len(taxas_mineradores)) / num_simulacoes
+    return tempos, blocos_ganhos
+
+
+def metricas(tempos, tempo_alvo=600.0, janela_media=144):
+    # Estabilidade: média e desvio do tempo de bloco e pior desvio da média móvel em relação ao alvo
+    num_janelas = tempos.shape[1] // janela_media
+    medias = tempos[:, :num_janelas * janela_media].reshape(tempos.shape[0], num_janelas, janela_media).mean(axis=2)
+    return {
+        "media": tempos.mean(),
+        "desvio": tempos.std(),
+        "pior_desvio_medio": np.abs(medias - tempo_alvo).max(axis=1).mean(),
+    }
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(42)
+    taxas_mineradores = rng.pareto(1.5, size=200) * 1e12  # poucos mineradores grandes, muitos pequenos
+    num_blocos = 20_160
+    # Choque de taxa: a rede dobra no bloco 6000 e cai para 70% no bloco 14000
+    perfil = np.ones(num_blocos)
+    perfil[6000:] = 2.0
+    perfil[14000:] = 0.7
+
+    for nome, algoritmo in [("Janela de 2016 blocos", RetargetJanela(2016)),
+                            ("Janela de 144 blocos", RetargetJanela(144)),
+                            ("EMA por bloco (alfa=1/144)", RetargetEMA(1 / 144)),
+                            ("EMA por bloco (alfa=1/36)", RetargetEMA(1 / 36))]:
+        inicio = time.perf_counter()
+        tempos, blocos_ganhos = simular(algoritmo, taxas_mineradores, perfil, num_simulacoes=500)
+        duracao = time.perf_counter() - inicio
+        m = metricas(tempos)
+        janelas = tempos.size / 2016
+        print(f"{nome}: média {m['media']:.0f}s, desvio {m['desvio']:.0f}s, "
+              f"pior desvio da média móvel {m['pior_desvio_medio']:.0f}s "
+              f"({janelas / duracao:,.0f} janelas de 2016 blocos por segundo)")
+
+    maior = np.argmax(taxas_mineradores)
+    print(f"Maior minerador: {taxas_mineradores[maior] / taxas_mineradores.sum():.1%} da taxa, "
+          f"{blocos_ganhos[maior] / num_blocos:.1%} dos blocos")
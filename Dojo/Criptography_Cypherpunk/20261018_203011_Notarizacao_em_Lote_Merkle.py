@@ -0,0 +1,149 @@
+# Este código adiciona um modo de notarização em lote à blockchain de notarização de documentos.
+# Os documentos são acumulados até um limite de quantidade ou de tempo; então é construída uma árvore de Merkle
+# e apenas a raiz é selada em um único bloco. Cada documento recebe uma prova de inclusão com O(log n) hashes,
+# que pode ser verificada de forma independente, só com o hash do documento e a raiz registrada no bloco.
+# Para executar, não são necessárias bibliotecas externas.
+
+import hashlib
+import time
+
+# Prefixos distintos para folhas e nós internos evitam ataques de segunda pré-imagem na árvore
+PREFIXO_FOLHA = b"\x00"
+PREFIXO_NO = b"\x01"
+
+
+def hash_folha(hash_documento):
+    return hashlib.sha256(PREFIXO_FOLHA + bytes.fromhex(hash_documento)).digest()
+
+
+def hash_no(esquerda, direita):
+    return hashlib.sha256(PREFIXO_NO + esquerda + direita).digest()
+
+
+def construir_arvore(folhas):
+    # Retorna os níveis da árvore, das folhas até a raiz; um nó sem par sobe sem ser combinado
+    niveis = [folhas]
+    while len(niveis[-1]) > 1:
+        atual = niveis[-1]
+        proximo = [hash_no(atual[i], atual[i + 1]) for i in range(0, len(atual) - 1, 2)]
+        if len(atual) % 2:
+            proximo.append(atual[-1])
+        niveis.append(proximo)
+    return niveis
+
+
+def prova_de_inclusao(niveis, indice):
+    # Lista de (hash irmão em hex, lado) do nível das folhas até logo abaixo da raiz
+    prova = []
+    for nivel in niveis[:-1]:
+        irmao = indice ^ 1
+        if irmao < len(nivel):
+            prova.append((nivel[irmao].hex(), "esquerda" if irmao < indice else "direita"))
+        indice //= 2
+    return prova
+
+
+def verificar_inclusao(hash_documento, prova, raiz_merkle):
+    # Verificador independente: não precisa da blockchain, só da raiz selada no bloco
+    atual = hash_folha(hash_documento)
+    for irmao, lado in prova:
+        irmao = bytes.fromhex(irmao)
+        atual = hash_no(irmao, atual) if lado == "esquerda" else hash_no(atual, irmao)
+    return atual.hex() == raiz_merkle
+
+
+class Bloco:
+    def __init__(self, indice, hash_documento, hash_anterior):
+        self.indice = indice
+        self.hash_documento = hash_documento  # no modo em lote, é a raiz de Merkle do lote
+        self.hash_anterior = hash_anterior
+        self.timestamp = time.time()
+        self.hash = self.calcular_hash()
+
+    def calcular_hash(self):
+        valor = f"{self.indice}{self.hash_documento}{self.hash_anterior}{self.timestamp}"
+        return hashlib.sha256(valor.encode()).hexdigest()
+
+
+class Blockchain:
+    def __init__(self):
+        self.cadeia = []
+        self.criar_bloco()
+
+    def criar_bloco(self, hash_documento=None):
+        indice = len(self.cadeia) + 1
+        hash_anterior = self.cadeia[-1].hash if self.cadeia else "0"
+        novo_bloco = Bloco(indice, hash_documento, hash_anterior)
+        self.cadeia.append(novo_bloco)
+        return novo_bloco
+
+    def notarizar_documento(self, documento):
+        hash_documento = hashlib.sha256(documento.encode()).hexdigest()
+        bloco = self.criar_bloco(hash_documento)
+        return bloco.hash
+
+
+class NotarizadorEmLote:
+    def __init__(self, blockchain, tamanho_maximo=1024, intervalo_maximo=1.0):
+        self.blockchain = blockchain
+        self.tamanho_maximo = tamanho_maximo
+        self.intervalo_maximo = intervalo_maximo  # segundos desde o primeiro documento pendente
+        self.pendentes = []
+        self.inicio_lote = None
+
+    def submeter(self, documento):
+        # Retorna os recibos do lote se esta submissão provocou o selamento, senão uma lista vazia
+        if not self.pendentes:
+            self.inicio_lote = time.monotonic()
+        self.pendentes.append(hashlib.sha256(documento.encode()).hexdigest())
+        if len(self.pendentes) >= self.tamanho_maximo:
+            return self.selar()
+        return self.verificar_prazo()
+
+    def verificar_prazo(self):
+        # Deve ser chamado periodicamente para selar lotes que atingiram o tempo máximo
+        if self.pendentes and time.monotonic() - self.inicio_lote >= self.intervalo_maximo:
+            return self.selar()
+        return []
+
+    def selar(self):
+        if not self.pendentes:
+            return []
+        niveis = construir_arvore([hash_folha(h) for h in self.pendentes])
+        raiz = niveis[-1][0].hex()
+        bloco = self.blockchain.criar_bloco(raiz)
+        recibos = [
+            {
+                "hash_documento": h,
+                "indice_bloco": bloco.indice,
+                "raiz_merkle": raiz,
+                "prova": prova_de_inclusao(niveis, i),
+            }
+            for i, h in enumerate(self.pendentes)
+        ]
+        self.pendentes = []
+        self.inicio_lote = None
+        return recibos
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    blockchain = Blockchain()
+    notarizador = NotarizadorEmLote(blockchain, tamanho_maximo=10_000)
+
+    inicio = time.perf_counter()
+    recibos = []
+    for i in range(100_000):
+        recibos.extend(notarizador.submeter(f"Documento importante número {i}"))
+    recibos.extend(notarizador.selar())
+    duracao = time.perf_counter() - inicio
+
+    print(f"{len(recibos)} documentos notarizados em {duracao:.2f}s")
+    print(f"Número de blocos na blockchain: {len(blockchain.cadeia)}")
+
+    recibo = recibos[12345]
+    bloco = blockchain.cadeia[recibo["indice_bloco"] - 1]
+    print(f"Prova de inclusão com {len(recibo['prova'])} hashes")
+    print("Prova válida:", verificar_inclusao(recibo["hash_documento"], recibo["prova"], bloco.hash_documento))
+    adulterado = hashlib.sha256("Documento adulterado".encode()).hexdigest()
+    print("Documento adulterado aceito:", verificar_inclusao(adulterado, recibo["prova"], bloco.hash_documento))
@@ -0,0 +1,329 @@
+# Este código torna persistente a blockchain de notarização de documentos.
+# Os blocos são gravados em segmentos somente de anexação, com registros binários de tamanho fixo
+# (índice, timestamp e os hashes em 32 bytes brutos), e lidos via mmap. Um índice hash em disco
+# (endereçamento aberto, também mapeado em memória) responde "este documento foi notarizado?" em O(1).
+# Ao reabrir, nada é recalculado: o último hash vem do último registro e só os blocos que ficaram fora
+# do índice (por exemplo, após uma queda) são indexados novamente. O índice cresce num arquivo temporário que só
+# substitui o antigo quando está completo, e um índice que aponta para blocos perdidos na queda é reconstruído.
+# Para executar, não são necessárias bibliotecas externas.
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+# indice, timestamp, hash_documento, hash_anterior, hash
+REGISTRO = struct.Struct("<Qd32s32s32s")
+REGISTROS_POR_SEGMENTO = 1 << 20
+
+CABECALHO_INDICE = struct.Struct("<8sQQ")  # assinatura, capacidade, blocos indexados
+ASSINATURA_INDICE = b"NOTAIDX1"
+TAMANHO_CABECALHO = 32
+ENTRADA = struct.Struct("<QQ")             # impressão digital do hash do documento, índice do bloco
+VAZIO = bytes(32)
+
+
+class Bloco:
+    def __init__(self, indice, hash_documento, hash_anterior, timestamp=None, hash=None):
+        self.indice = indice
+        self.hash_documento = hash_documento
+        self.hash_anterior = hash_anterior
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.hash = hash or self.calcular_hash()
+
+    def calcular_hash(self):
+        valor = f"{self.indice}{self.hash_documento}{self.hash_anterior}{self.timestamp}"
+        return hashlib.sha256(valor.encode()).hexdigest()
+
+    def empacotar(self):
+        # O bloco gênese não tem documento (None) e seu hash anterior é "0": ambos viram 32 bytes zero
+        hash_documento = bytes.fromhex(self.hash_documento) if self.hash_documento else VAZIO
+        hash_anterior = bytes.fromhex(self.hash_anterior) if self.hash_anterior != "0" else VAZIO
+        return REGISTRO.pack(self.indice, self.timestamp, hash_documento, hash_anterior, bytes.fromhex(self.hash))
+
+    @classmethod
+    def de_registro(cls, campos):
+        indice, timestamp, hash_documento, hash_anterior, hash_bloco = campos
+        return cls(indice,
+                   hash_documento.hex() if hash_documento != VAZIO else None,
+                   hash_anterior.hex() if hash_anterior != VAZIO else "0",
+                   timestamp, hash_bloco.hex())
+
+
+def _sincronizar_diretorio(diretorio):
+    # Torna durável a renomeação do índice
+    fd = os.open(diretorio, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def impressao_digital(hash_documento_bruto):
+    # 0 marca uma entrada vazia no índice, então nunca é usado como impressão digital
+    return int.from_bytes(hash_documento_bruto[:8], "little") or 1
+
+
+class IndiceHash:
+    # Tabela hash com sondagem linear em um arquivo mapeado em memória; cresce dobrando a capacidade
+    def __init__(self, caminho, capacidade_inicial=1 << 16):
+        self.caminho = caminho
+        if os.path.exists(caminho + ".novo"):
+            os.remove(caminho + ".novo")  # crescimento interrompido: o índice antigo continua valendo
+        if not os.path.exists(caminho) or not self._completo(caminho):
+            self._criar(caminho, capacidade_inicial)
+            self._abrir()
+            self._gravar_cabecalho(0)
+        else:
+            self._abrir()
+
+    @staticmethod
+    def _completo(caminho):
+        # A assinatura é gravada depois da tabela; sem ela, a criação foi interrompida
+        with open(caminho, "rb") as arquivo:
+            return arquivo.read(len(ASSINATURA_INDICE)) not in (b"", bytes(len(ASSINATURA_INDICE)))
+
+    @staticmethod
+    def _criar(caminho, capacidade):
+        # Cabeçalho zerado até a tabela estar pronta
+        with open(caminho, "wb") as arquivo:
+            arquivo.truncate(TAMANHO_CABECALHO + capacidade * ENTRADA.size)
+
+    def _abrir(self):
+        self.arquivo = open(self.caminho, "r+b")
+        self.mapa = mmap.mmap(self.arquivo.fileno(), 0)
+        assinatura, self.capacidade, self.indexados = CABECALHO_INDICE.unpack_from(self.mapa, 0)
+        if assinatura == bytes(len(ASSINATURA_INDICE)):
+            self.capacidade = (len(self.mapa) - TAMANHO_CABECALHO) // ENTRADA.size
+        elif assinatura != ASSINATURA_INDICE:
+            raise ValueError(f"{self.caminho} não é um índice de notarização")
+        self.ocupados = self.indexados
+
+    def _gravar_cabecalho(self, indexados):
+        self.indexados = indexados
+        CABECALHO_INDICE.pack_into(self.mapa, 0, ASSINATURA_INDICE, self.capacidade, indexados)
+
+    def fechar(self):
+        self.mapa.flush()
+        self.mapa.close()
+        self.arquivo.close()
+
+    def _inserir_entrada(self, impressao, indice_bloco):
+        mascara = self.capacidade - 1
+        posicao = impressao & mascara
+        while ENTRADA.unpack_from(self.mapa, TAMANHO_CABECALHO + posicao * ENTRADA.size)[0]:
+            posicao = (posicao + 1) & mascara
+        ENTRADA.pack_into(self.mapa, TAMANHO_CABECALHO + posicao * ENTRADA.size, impressao, indice_bloco)
+
+    def _crescer(self):
+        # Reconstrói com o dobro da capacidade a partir das próprias entradas, sem ler os blocos. A tabela nova
+        # é montada inteira num arquivo temporário, com o cabeçalho por último, e só então substitui a antiga:
+        # uma queda no meio deixa o índice antigo intacto
+        entradas = [ENTRADA.unpack_from(self.mapa, TAMANHO_CABECALHO + i * ENTRADA.size)
+                    for i in range(self.capacidade)]
+        indexados = self.indexados
+        self.fechar()
+        temporario = self.caminho + ".novo"
+        self._criar(temporario, self.capacidade * 2)
+        caminho, self.caminho = self.caminho, temporario
+        self._abrir()
+        for impressao, indice_bloco in entradas:
+            if impressao:
+                self._inserir_entrada(impressao, indice_bloco)
+        self._gravar_cabecalho(indexados)
+        self.mapa.flush()
+        os.fsync(self.arquivo.fileno())
+        self.fechar()
+        self.caminho = caminho
+        os.replace(temporario, caminho)
+        _sincronizar_diretorio(os.path.dirname(caminho) or ".")
+        self._abrir()
+
+    def inserir(self, hash_documento_bruto, indice_bloco):
+        if (self.ocupados + 1) * 2 > self.capacidade:
+            self._crescer()
+        self._inserir_entrada(impressao_digital(hash_documento_bruto), indice_bloco)
+        self.ocupados += 1
+
+    def marcar_indexados(self, indexados):
+        self._gravar_cabecalho(indexados)
+
+    def candidatos(self, hash_documento_bruto):
+        # Índices de bloco cuja impressão digital coincide; o chamador confirma lendo o registro
+        impressao = impressao_digital(hash_documento_bruto)
+        mascara = self.capacidade - 1
+        posicao = impressao & mascara
+        while True:
+            atual, indice_bloco = ENTRADA.unpack_from(self.mapa, TAMANHO_CABECALHO + posicao * ENTRADA.size)
+            if not atual:
+                return
+            if atual == impressao:
+                yield indice_bloco
+            posicao = (posicao + 1) & mascara
+
+
+class ArmazemDeBlocos:
+    def __init__(self, diretorio, sincronizar=False):
+        self.diretorio = diretorio
+        self.sincronizar = sincronizar  # fsync após cada bloco
+        os.makedirs(diretorio, exist_ok=True)
+        self.mapas = {}
+        self.num_blocos = 0
+        self.segmento_escrita = None
+        numero = 0
+        while os.path.exists(self._caminho_segmento(numero)):
+            tamanho = os.path.getsize(self._caminho_segmento(numero))
+            # Um registro incompleto no fim (queda durante a escrita) é descartado
+            self.num_blocos += tamanho // REGISTRO.size
+            numero += 1
+        if numero:
+            self._truncar_ultimo(numero - 1)
+
+        caminho_indice = os.path.join(diretorio, "indice.dat")
+        self.indice = IndiceHash(caminho_indice)
+        if self.indice.indexados > self.num_blocos:
+            # O índice foi ao disco antes dos blocos (queda sem fsync) e aponta para registros que não existem:
+            # é descartado e reconstruído a partir dos segmentos
+            self.indice.fechar()
+            os.remove(caminho_indice)
+            self.indice = IndiceHash(caminho_indice)
+        for posicao in range(self.indice.indexados, self.num_blocos):
+            self.indice.inserir(self._registro(posicao)[2], posicao + 1)
+        self.indice.marcar_indexados(self.num_blocos)
+        # Mantido em memória: ler o último registro a cada anexação obrigaria a remapear o segmento que cresce
+        self.hash_ultimo = self._registro(self.num_blocos - 1)[4].hex() if self.num_blocos else None
+
+    def _caminho_segmento(self, numero):
+        return os.path.join(self.diretorio, f"segmento_{numero:06d}.dat")
+
+    def _truncar_ultimo(self, numero):
+        caminho = self._caminho_segmento(numero)
+        if os.path.exists(caminho):
+            with open(caminho, "r+b") as arquivo:
+                arquivo.truncate(os.path.getsize(caminho) // REGISTRO.size * REGISTRO.size)
+
+    def _mapa(self, numero, tamanho_necessario):
+        # Remapeia o segmento quando ele cresceu além da área já mapeada
+        mapa = self.mapas.get(numero)
+        if mapa is None or len(mapa) < tamanho_necessario:
+            if mapa is not None:
+                mapa.close()
+            with open(self._caminho_segmento(numero), "rb") as arquivo:
+                mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            self.mapas[numero] = mapa
+        return mapa
+
+    def _registro(self, posicao):
+        numero, deslocamento = divmod(posicao, REGISTROS_POR_SEGMENTO)
+        inicio = deslocamento * REGISTRO.size
+        return REGISTRO.unpack_from(self._mapa(numero, inicio + REGISTRO.size), inicio)
+
+    def ler_bloco(self, indice):
+        # Os índices de bloco começam em 1, como na Blockchain original
+        return Bloco.de_registro(self._registro(indice - 1))
+
+    def ultimo_hash(self):
+        return self.hash_ultimo
+
+    def anexar(self, bloco):
+        numero = self.num_blocos // REGISTROS_POR_SEGMENTO
+        if self.segmento_escrita is None or self.segmento_escrita[0] != numero:
+            if self.segmento_escrita is not None:
+                self.segmento_escrita[1].close()
+            self.segmento_escrita = (numero, open(self._caminho_segmento(numero), "ab"))
+        arquivo = self.segmento_escrita[1]
+        registro = bloco.empacotar()
+        arquivo.write(registro)
+        arquivo.flush()
+        if self.sincronizar:
+            os.fsync(arquivo.fileno())
+        self.num_blocos += 1
+        self.hash_ultimo = bloco.hash
+        self.indice.inserir(registro[16:48], bloco.indice)
+        self.indice.marcar_indexados(self.num_blocos)
+
+    def procurar(self, hash_documento):
+        # Retorna o índice do bloco que notarizou o hash, ou None
+        bruto = bytes.fromhex(hash_documento)
+        for indice_bloco in self.indice.candidatos(bruto):
+            if self._registro(indice_bloco - 1)[2] == bruto:
+                return indice_bloco
+        return None
+
+    def fechar(self):
+        if self.segmento_escrita is not None:
+            self.segmento_escrita[1].close()
+        for mapa in self.mapas.values():
+            mapa.close()
+        self.indice.fechar()
+
+
+class Blockchain:
+    def __init__(self, diretorio):
+        self.armazem = ArmazemDeBlocos(diretorio)
+        if self.armazem.num_blocos == 0:
+            self.criar_bloco()
+
+    def criar_bloco(self, hash_documento=None):
+        indice = self.armazem.num_blocos + 1
+        hash_anterior = self.armazem.ultimo_hash() or "0"
+        novo_bloco = Bloco(indice, hash_documento, hash_anterior)
+        self.armazem.anexar(novo_bloco)
+        return novo_bloco
+
+    def notarizar_documento(self, documento):
+        hash_documento = hashlib.sha256(documento.encode()).hexdigest()
+        bloco = self.criar_bloco(hash_documento)
+        return bloco.hash
+
+    def foi_notarizado(self, documento):
+        return self.armazem.procurar(hashlib.sha256(documento.encode()).hexdigest())
+
+    def fechar(self):
+        self.armazem.fechar()
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as diretorio:
+        blockchain = Blockchain(diretorio)
+        inicio = time.perf_counter()
+        for i in range(200_000):
+            blockchain.notarizar_documento(f"Documento importante número {i}")
+        print(f"200000 documentos notarizados em {time.perf_counter() - inicio:.2f}s")
+        blockchain.fechar()
+
+        # Reabertura: o último hash vem do disco e o índice já está pronto
+        inicio = time.perf_counter()
+        blockchain = Blockchain(diretorio)
+        print(f"Blockchain reaberta em {(time.perf_counter() - inicio) * 1e3:.2f} ms "
+              f"com {blockchain.armazem.num_blocos} blocos")
+
+        hashes = [hashlib.sha256(f"Documento importante número {i}".encode()).hexdigest() for i in range(10_000)]
+        inicio = time.perf_counter()
+        for hash_documento in hashes:
+            blockchain.armazem.procurar(hash_documento)
+        print(f"Consulta por hash em {(time.perf_counter() - inicio) / len(hashes) * 1e6:.1f} µs")
+
+        encontrado = blockchain.foi_notarizado("Documento importante número 123456")
+        ausente = blockchain.foi_notarizado("Documento nunca notarizado")
+        print(f"Documento 123456 no bloco {encontrado}, documento ausente -> {ausente}")
+
+        bloco = blockchain.armazem.ler_bloco(encontrado)
+        print("Hash do bloco confere:", bloco.hash == bloco.calcular_hash())
+        blockchain.fechar()
+
+        # Queda simulada: o índice foi ao disco, mas os últimos 1000 blocos não, e um crescimento ficou pela metade
+        caminho_segmento = blockchain.armazem._caminho_segmento(0)
+        with open(caminho_segmento, "r+b") as arquivo:
+            arquivo.truncate(os.path.getsize(caminho_segmento) - 1000 * REGISTRO.size)
+        with open(os.path.join(diretorio, "indice.dat.novo"), "wb") as arquivo:
+            arquivo.write(os.urandom(100))
+        inicio = time.perf_counter()
+        blockchain = Blockchain(diretorio)
+        print(f"Reaberta após a queda em {time.perf_counter() - inicio:.2f}s com {blockchain.armazem.num_blocos} "
+              f"blocos; documento 199500 -> {blockchain.foi_notarizado('Documento importante número 199500')}, "
+              f"documento 123456 -> {blockchain.foi_notarizado('Documento importante número 123456')}")
+        blockchain.fechar()
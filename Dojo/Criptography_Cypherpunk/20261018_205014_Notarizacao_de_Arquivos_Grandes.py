@@ -0,0 +1,114 @@
+# Este código permite notarizar arquivos grandes sem carregá-los inteiros na memória.
+# O arquivo é lido em blocos de tamanho fixo com readinto() em um buffer reutilizado, e cada bloco é passado ao
+# SHA-256 por uma memoryview, sem cópias. Vários arquivos podem ser processados em paralelo com um pool de
+# threads, já que o hashlib libera o GIL ao processar blocos grandes. A vazão em MB/s é relatada para
+# dimensionar as máquinas de ingestão.
+# Para executar, não são necessárias bibliotecas externas.
+
+import hashlib
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+TAMANHO_BLOCO = 1 << 20  # 1 MiB por leitura
+
+
+class Bloco:
+    def __init__(self, indice, hash_documento, hash_anterior):
+        self.indice = indice
+        self.hash_documento = hash_documento
+        self.hash_anterior = hash_anterior
+        self.timestamp = time.time()
+        self.hash = self.calcular_hash()
+
+    def calcular_hash(self):
+        valor = f"{self.indice}{self.hash_documento}{self.hash_anterior}{self.timestamp}"
+        return hashlib.sha256(valor.encode()).hexdigest()
+
+
+def hash_de_arquivo(arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    # Aceita um caminho ou um objeto de arquivo binário; retorna (hash hexadecimal, bytes lidos)
+    if isinstance(arquivo, (str, bytes, os.PathLike)):
+        # buffering=0 faz o readinto ler direto para o nosso buffer, sem passar pelo BufferedReader
+        with open(arquivo, "rb", buffering=0) as f:
+            return hash_de_arquivo(f, tamanho_bloco)
+
+    h = hashlib.sha256()
+    buffer = bytearray(tamanho_bloco)
+    visao = memoryview(buffer)
+    total = 0
+    while True:
+        lidos = arquivo.readinto(visao)
+        if not lidos:
+            break
+        h.update(visao[:lidos])
+        total += lidos
+    return h.hexdigest(), total
+
+
+def hash_de_arquivos(caminhos, max_workers=None, tamanho_bloco=TAMANHO_BLOCO):
+    # Retorna ({caminho: hash}, MB/s agregado)
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        resultados = list(executor.map(lambda c: hash_de_arquivo(c, tamanho_bloco), caminhos))
+    duracao = time.perf_counter() - inicio
+    total = sum(lidos for _, lidos in resultados)
+    return {c: h for c, (h, _) in zip(caminhos, resultados)}, total / 1e6 / duracao
+
+
+class Blockchain:
+    def __init__(self):
+        self.cadeia = []
+        self.criar_bloco()
+
+    def criar_bloco(self, hash_documento=None):
+        indice = len(self.cadeia) + 1
+        hash_anterior = self.cadeia[-1].hash if self.cadeia else "0"
+        novo_bloco = Bloco(indice, hash_documento, hash_anterior)
+        self.cadeia.append(novo_bloco)
+        return novo_bloco
+
+    def notarizar_documento(self, documento):
+        hash_documento = hashlib.sha256(documento.encode()).hexdigest()
+        bloco = self.criar_bloco(hash_documento)
+        return bloco.hash
+
+    def notarizar_arquivo(self, arquivo):
+        # Caminho ou objeto de arquivo binário aberto
+        hash_documento, _ = hash_de_arquivo(arquivo)
+        return self.criar_bloco(hash_documento).hash
+
+    def notarizar_arquivos(self, caminhos, max_workers=None):
+        # Hashes em paralelo; os blocos são criados na ordem dos caminhos
+        hashes, vazao = hash_de_arquivos(caminhos, max_workers)
+        return [self.criar_bloco(hashes[c]).hash for c in caminhos], vazao
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    blockchain = Blockchain()
+    with tempfile.TemporaryDirectory() as pasta:
+        caminhos = []
+        for i in range(4):
+            caminho = os.path.join(pasta, f"documento_{i}.bin")
+            with open(caminho, "wb") as f:
+                for _ in range(64):
+                    f.write(os.urandom(1 << 20))
+            caminhos.append(caminho)
+
+        # Confere que o hash em blocos é igual ao hash do conteúdo inteiro
+        with open(caminhos[0], "rb") as f:
+            esperado = hashlib.sha256(f.read()).hexdigest()
+        print("Hash em blocos confere:", hash_de_arquivo(caminhos[0])[0] == esperado)
+
+        inicio = time.perf_counter()
+        for caminho in caminhos:
+            blockchain.notarizar_arquivo(caminho)
+        duracao = time.perf_counter() - inicio
+        tamanho_total = sum(os.path.getsize(c) for c in caminhos)
+        print(f"Sequencial: {tamanho_total / 1e6 / duracao:.0f} MB/s")
+
+        _, vazao = blockchain.notarizar_arquivos(caminhos, max_workers=len(caminhos))
+        print(f"Paralelo com {len(caminhos)} threads: {vazao:.0f} MB/s")
+        print(f"Número de blocos na blockchain: {len(blockchain.cadeia)}")
@@ -0,0 +1,115 @@
+# Este código traz uma representação compacta dos blocos da blockchain de notarização e a verificação
+# da integridade da cadeia em paralelo. Cada bloco usa __slots__ e guarda os hashes como digests brutos
+# de 32 bytes; o hash do bloco é o SHA-256 do cabeçalho empacotado com struct, sem concatenar strings.
+# A verificação divide a cadeia serializada em trechos contíguos, recalcula hashes e ligações em vários
+# processos e informa o índice do primeiro bloco quebrado.
+# Para executar, não são necessárias bibliotecas externas.
+
+import hashlib
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+CABECALHO = struct.Struct("<Qd32s32s")       # indice, timestamp, hash_documento, hash_anterior
+REGISTRO = struct.Struct("<Qd32s32s32s")     # cabeçalho seguido do hash do bloco
+DIGEST_ZERO = bytes(32)
+
+
+class Bloco:
+    __slots__ = ("indice", "timestamp", "hash_documento", "hash_anterior", "hash")
+
+    def __init__(self, indice, hash_documento, hash_anterior, timestamp=None):
+        self.indice = indice
+        self.hash_documento = hash_documento  # 32 bytes brutos
+        self.hash_anterior = hash_anterior    # 32 bytes brutos
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.hash = self.calcular_hash()
+
+    def calcular_hash(self):
+        cabecalho = CABECALHO.pack(self.indice, self.timestamp, self.hash_documento, self.hash_anterior)
+        return hashlib.sha256(cabecalho).digest()
+
+    def empacotar(self):
+        return REGISTRO.pack(self.indice, self.timestamp, self.hash_documento, self.hash_anterior, self.hash)
+
+
+class Blockchain:
+    def __init__(self):
+        self.cadeia = []
+        self.criar_bloco()
+
+    def criar_bloco(self, hash_documento=DIGEST_ZERO):
+        indice = len(self.cadeia) + 1
+        hash_anterior = self.cadeia[-1].hash if self.cadeia else DIGEST_ZERO
+        novo_bloco = Bloco(indice, hash_documento, hash_anterior)
+        self.cadeia.append(novo_bloco)
+        return novo_bloco
+
+    def notarizar_documento(self, documento):
+        hash_documento = hashlib.sha256(documento.encode()).digest()
+        bloco = self.criar_bloco(hash_documento)
+        return bloco.hash.hex()
+
+    def serializar(self):
+        return b"".join(bloco.empacotar() for bloco in self.cadeia)
+
+
+def _verificar_trecho(dados, posicao_inicial, hash_esperado):
+    # Retorna a posição (0-based) do primeiro registro inválido do trecho, ou None
+    sha256 = hashlib.sha256
+    tamanho_cabecalho = CABECALHO.size
+    for i, (indice, _, _, hash_anterior, hash_bloco) in enumerate(REGISTRO.iter_unpack(dados)):
+        inicio = i * REGISTRO.size
+        if (indice != posicao_inicial + i + 1
+                or hash_anterior != hash_esperado
+                or sha256(dados[inicio:inicio + tamanho_cabecalho]).digest() != hash_bloco):
+            return posicao_inicial + i
+        hash_esperado = hash_bloco
+    return None
+
+
+def verificar_cadeia(dados, num_processos=None, blocos_por_trecho=50_000):
+    # dados: cadeia serializada (Blockchain.serializar()); retorna o índice (1-based) do primeiro bloco
+    # quebrado ou None se a cadeia está íntegra
+    num_blocos = len(dados) // REGISTRO.size
+    trechos, posicoes, esperados = [], [], []
+    for inicio in range(0, num_blocos, blocos_por_trecho):
+        fim = min(inicio + blocos_por_trecho, num_blocos)
+        trechos.append(dados[inicio * REGISTRO.size:fim * REGISTRO.size])
+        posicoes.append(inicio)
+        # O hash anterior esperado no começo do trecho é o hash armazenado no último bloco do trecho anterior;
+        # se esse bloco estiver adulterado, o trecho anterior o acusa
+        if inicio == 0:
+            esperados.append(DIGEST_ZERO)
+        else:
+            esperados.append(REGISTRO.unpack_from(dados, (inicio - 1) * REGISTRO.size)[4])
+
+    with ProcessPoolExecutor(max_workers=num_processos) as executor:
+        for quebrado in executor.map(_verificar_trecho, trechos, posicoes, esperados):
+            if quebrado is not None:
+                return quebrado + 1
+    return None
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    blockchain = Blockchain()
+    inicio = time.perf_counter()
+    for i in range(500_000):
+        blockchain.notarizar_documento(f"Documento importante número {i}")
+    print(f"{len(blockchain.cadeia)} blocos criados em {time.perf_counter() - inicio:.2f}s")
+
+    dados = blockchain.serializar()
+    print(f"Cadeia serializada: {len(dados) / 2**20:.1f} MiB ({REGISTRO.size} bytes por bloco)")
+
+    inicio = time.perf_counter()
+    resultado = verificar_cadeia(dados)
+    print(f"Verificação com {os.cpu_count()} processos em {time.perf_counter() - inicio:.2f}s: "
+          f"{'íntegra' if resultado is None else f'quebrada no bloco {resultado}'}")
+
+    # Adultera o hash do documento do bloco 123457
+    adulterada = bytearray(dados)
+    deslocamento = 123456 * REGISTRO.size + 16
+    adulterada[deslocamento] ^= 0xFF
+    print("Cadeia adulterada quebrada no bloco:", verificar_cadeia(bytes(adulterada)))
@@ -0,0 +1,103 @@
+# Este código corrige o encadeamento do sistema de timestamping distribuído: cada bloco agora é identificado
+# pelo SHA-256 do seu cabeçalho, que inclui o hash do bloco anterior e timestamps reais.
+# Além do ponteiro para o anterior, o bloco de índice i guarda ponteiros de skip list para os blocos
+# i - 2^k sempre que i é múltiplo de 2^k. Assim, provar que o registro A veio antes do registro B exige só
+# O(log n) cabeçalhos: o caminho de B até A pelos ponteiros, que qualquer um verifica recalculando os hashes.
+# Para rodar este código, não são necessárias bibliotecas externas.
+
+import hashlib
+import time
+from datetime import datetime, timezone
+
+
+def sha256_hex(dados):
+    return hashlib.sha256(dados.encode()).hexdigest()
+
+
+class Block:
+    def __init__(self, index, timestamp, data, previous_hash, skip_hashes=()):
+        self.index = index
+        self.timestamp = timestamp
+        self.data = data
+        self.previous_hash = previous_hash
+        self.skip_hashes = list(skip_hashes)  # hashes dos blocos index - 2, index - 4, index - 8, ...
+        self.hash = hash_header(self.header())
+
+    def header(self):
+        # O cabeçalho leva só o hash dos dados, então as provas não precisam carregar os registros
+        return (self.index, self.timestamp, sha256_hex(self.data), self.previous_hash, tuple(self.skip_hashes))
+
+    def pointers(self):
+        # (índice de destino, hash) de todos os ponteiros do bloco
+        return [(self.index - 1, self.previous_hash)] + [
+            (self.index - (2 << k), h) for k, h in enumerate(self.skip_hashes)]
+
+
+def hash_header(header):
+    index, timestamp, data_hash, previous_hash, skip_hashes = header
+    return sha256_hex(f"{index}|{timestamp}|{data_hash}|{previous_hash}|{','.join(skip_hashes)}")
+
+
+def create_genesis_block():
+    return Block(0, datetime.now(timezone.utc).isoformat(), "Genesis Block", "0")
+
+
+def create_new_block(blockchain, data):
+    index = len(blockchain)
+    timestamp = datetime.now(timezone.utc).isoformat()
+    skip_hashes = []
+    salto = 2
+    while index % salto == 0:
+        skip_hashes.append(blockchain[index - salto].hash)
+        salto *= 2
+    return Block(index, timestamp, data, blockchain[-1].hash, skip_hashes)
+
+
+def prove_order(blockchain, index_a, index_b):
+    # Cabeçalhos no caminho de B até A, sempre pelo maior salto que não passa de A
+    if index_a > index_b:
+        raise ValueError("O registro A precisa ter índice menor ou igual ao de B")
+    proof = [blockchain[index_b].header()]
+    atual = index_b
+    while atual != index_a:
+        destino = min(d for d, _ in blockchain[atual].pointers() if d >= index_a)
+        proof.append(blockchain[destino].header())
+        atual = destino
+    return proof
+
+
+def verify_order(proof, hash_a, hash_b):
+    # Verifica, só com hashes, que o bloco hash_a é ancestral do bloco hash_b
+    if not proof or hash_header(proof[0]) != hash_b:
+        return False
+    for atual, anterior in zip(proof, proof[1:]):
+        index, _, _, previous_hash, skip_hashes = atual
+        ponteiros = [(index - 1, previous_hash)] + [(index - (2 << k), h) for k, h in enumerate(skip_hashes)]
+        if (anterior[0], hash_header(anterior)) not in ponteiros:
+            return False
+    return hash_header(proof[-1]) == hash_a
+
+
+# Criando a cadeia de blocos
+blockchain = [create_genesis_block()]
+
+# Adicionando novos blocos
+for i in range(1, 5):
+    new_block = create_new_block(blockchain, f"Block {i} Data")
+    blockchain.append(new_block)
+    print(f"Block {new_block.index} has been added to the blockchain!")
+    print(f"Hash: {new_block.hash}")
+    print(f"Previous hash: {new_block.previous_hash}")
+    print(f"Data: {new_block.data}\n")
+
+# Uma história longa e uma prova de ordem entre dois registros distantes
+inicio = time.perf_counter()
+for i in range(5, 200_000):
+    blockchain.append(create_new_block(blockchain, f"Registro {i}"))
+print(f"{len(blockchain)} blocos criados em {time.perf_counter() - inicio:.2f}s")
+
+a, b = 1234, 198_765
+proof = prove_order(blockchain, a, b)
+print(f"Prova de que o registro {a} veio antes do {b}: {len(proof)} cabeçalhos")
+print("Prova válida:", verify_order(proof, blockchain[a].hash, blockchain[b].hash))
+print("Ordem invertida aceita:", verify_order(proof, blockchain[b].hash, blockchain[a].hash))
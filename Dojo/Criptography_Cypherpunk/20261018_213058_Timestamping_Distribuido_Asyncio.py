@@ -0,0 +1,140 @@
+# Este código simula um serviço de timestamping realmente distribuído: N nós locais, cada um como uma tarefa
+# asyncio, trocando mensagens por filas em memória com uma latência de rede configurável.
+# Os clientes enviam registros concorrentemente ao líder, que atribui a próxima posição na ordem, encadeia o
+# hash e replica o bloco para os seguidores; o registro é confirmado quando uma maioria (quórum) o aceitou.
+# O harness mede a vazão sustentada (registros por segundo) e a latência p99 de confirmação ao variar N
+# e a concorrência dos clientes. Para rodar este código, não são necessárias bibliotecas externas.
+
+import asyncio
+import hashlib
+import random
+import statistics
+import time
+
+
+class Block:
+    def __init__(self, index, timestamp, data, previous_hash):
+        self.index = index
+        self.timestamp = timestamp
+        self.data = data
+        self.previous_hash = previous_hash
+        self.hash = hashlib.sha256(f"{index}|{timestamp}|{data}|{previous_hash}".encode()).hexdigest()
+
+
+class No:
+    def __init__(self, identificador, cluster):
+        self.identificador = identificador
+        self.cluster = cluster
+        self.caixa_de_entrada = asyncio.Queue()
+        self.blockchain = [Block(0, 0.0, "Genesis Block", "0")]
+
+    async def executar(self):
+        while True:
+            mensagem = await self.caixa_de_entrada.get()
+            if mensagem is None:
+                return
+            bloco, resposta = mensagem
+            # Seguidor: só aceita o bloco se ele encadeia com o último que conhece
+            aceito = bloco.index == len(self.blockchain) and bloco.previous_hash == self.blockchain[-1].hash
+            if aceito:
+                self.blockchain.append(bloco)
+            self.cluster.enviar(resposta, (self.identificador, aceito))
+
+
+class Lider(No):
+    def __init__(self, identificador, cluster, tamanho_lote):
+        super().__init__(identificador, cluster)
+        self.tamanho_lote = tamanho_lote
+
+    async def executar(self):
+        # Agrupa os registros que chegaram desde a última rodada em um bloco e replica para os seguidores
+        while True:
+            primeiro = await self.caixa_de_entrada.get()
+            if primeiro is None:
+                return
+            pendentes = [primeiro]
+            while not self.caixa_de_entrada.empty() and len(pendentes) < self.tamanho_lote:
+                proximo = self.caixa_de_entrada.get_nowait()
+                if proximo is None:
+                    return
+                pendentes.append(proximo)
+
+            anterior = self.blockchain[-1]
+            dados = [registro for registro, _ in pendentes]
+            bloco = Block(anterior.index + 1, time.time(), dados, anterior.hash)
+            self.blockchain.append(bloco)
+            await self.replicar(bloco)
+            for _, confirmacao in pendentes:
+                confirmacao.set_result(bloco.index)
+
+    async def replicar(self, bloco):
+        respostas = asyncio.Queue()
+        for seguidor in self.cluster.seguidores:
+            self.cluster.enviar(seguidor.caixa_de_entrada, (bloco, respostas))
+        # O próprio líder conta como um voto; espera até atingir a maioria
+        votos = 1
+        while votos < self.cluster.quorum:
+            _, aceito = await respostas.get()
+            votos += aceito
+
+
+class Cluster:
+    def __init__(self, num_nos, latencia=0.0005, tamanho_lote=256):
+        self.latencia = latencia
+        self.quorum = num_nos // 2 + 1
+        self.lider = Lider(0, self, tamanho_lote)
+        self.seguidores = [No(i, self) for i in range(1, num_nos)]
+        self.nos = [self.lider] + self.seguidores
+
+    def enviar(self, fila, mensagem):
+        # Entrega após a latência de rede simulada, sem bloquear o remetente
+        asyncio.get_running_loop().call_later(self.latencia * random.uniform(0.5, 1.5), fila.put_nowait, mensagem)
+
+    async def submeter(self, registro):
+        confirmacao = asyncio.get_running_loop().create_future()
+        self.enviar(self.lider.caixa_de_entrada, (registro, confirmacao))
+        return await confirmacao
+
+    def iniciar(self):
+        return [asyncio.create_task(no.executar()) for no in self.nos]
+
+    async def parar(self, tarefas):
+        for no in self.nos:
+            no.caixa_de_entrada.put_nowait(None)
+        await asyncio.gather(*tarefas)
+
+
+async def cliente(cluster, identificador, fim, latencias):
+    contador = 0
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        await cluster.submeter(f"cliente {identificador} registro {contador}")
+        latencias.append(time.perf_counter() - inicio)
+        contador += 1
+
+
+async def medir(num_nos, num_clientes, duracao=1.0):
+    cluster = Cluster(num_nos)
+    tarefas = cluster.iniciar()
+    latencias = []
+    fim = time.perf_counter() + duracao
+    await asyncio.gather(*(cliente(cluster, i, fim, latencias) for i in range(num_clientes)))
+    await cluster.parar(tarefas)
+
+    # Todos os seguidores que acompanharam o quórum devem ter o mesmo prefixo da cadeia do líder
+    consistente = all(no.blockchain[-1].hash == cluster.lider.blockchain[len(no.blockchain) - 1].hash
+                      for no in cluster.seguidores)
+    p99 = statistics.quantiles(latencias, n=100)[98] if len(latencias) > 1 else float("nan")
+    return len(latencias) / duracao, p99, consistente
+
+
+async def main():
+    print(f"{'nós':>4} {'clientes':>9} {'registros/s':>12} {'p99 (ms)':>9}  consistente")
+    for num_nos in (1, 3, 5, 9):
+        for num_clientes in (10, 100, 1000):
+            vazao, p99, consistente = await medir(num_nos, num_clientes)
+            print(f"{num_nos:>4} {num_clientes:>9} {vazao:>12,.0f} {p99 * 1e3:>9.2f}  {consistente}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
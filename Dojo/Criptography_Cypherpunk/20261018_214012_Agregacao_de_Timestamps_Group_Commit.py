@@ -0,0 +1,214 @@
+# Este código implementa um pipeline de ingestão de alta vazão para o serviço de timestamping.
+# Várias threads produtoras enviam registros para uma fila limitada; uma única thread agregadora, a cada tick,
+# esvazia a fila e sela todos os registros pendentes em um único bloco encadeado por hash, com timestamps
+# reais (relógio de parede e monotônico, em nanossegundos). Cada bloco é gravado em um log durável com uma
+# única escrita e um único fsync (group commit), em vez de um fsync por registro.
+# A ordem é garantida: registros de um mesmo produtor aparecem na ordem em que foram enviados, e a ordem
+# global é (índice do bloco, posição no bloco). Ao reiniciar, a cadeia continua do último bloco do log, e um bloco
+# final cortado por uma queda é descartado. Para rodar este código, não são necessárias bibliotecas externas.
+
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+
+
+class AgregadorDeTimestamps:
+    def __init__(self, caminho_log, intervalo=0.01, capacidade=1_000_000):
+        self.caminho_log = caminho_log
+        self.intervalo = intervalo        # duração do tick em segundos
+        self.capacidade = capacidade      # limite de registros pendentes (contrapressão)
+        self.fila = deque()               # append e popleft são atômicos no CPython, sem lock no caminho comum
+        self.espaco = threading.Condition()
+        self.persistido = threading.Condition()
+        self.tick_atual = 0
+        self.tick_persistido = -1
+        self.indice = 0
+        self.hash_anterior = "0"
+        self.rodando = False
+        self.thread = None
+        self.erro = None  # falha da thread agregadora; a partir dela nenhum registro é aceito
+
+    def iniciar(self):
+        # Continua a cadeia do log existente. O que vem depois do último bloco íntegro foi cortado por uma queda
+        # no meio da escrita, nunca foi confirmado a ninguém e é descartado
+        fim, entrada = _ultimo_bloco(self.caminho_log) if os.path.exists(self.caminho_log) else (0, None)
+        if entrada is not None:
+            self.indice = entrada["bloco"]["indice"] + 1
+            self.hash_anterior = entrada["hash"]
+        self.log = open(self.caminho_log, "ab")
+        if self.log.tell() > fim:
+            self.log.truncate(fim)
+            os.fsync(self.log.fileno())
+        self.rodando = True
+        self.thread = threading.Thread(target=self._agregar, daemon=True)
+        self.thread.start()
+
+    def parar(self):
+        self.rodando = False
+        self.thread.join()
+        self.log.close()
+
+    def enviar(self, registro):
+        if len(self.fila) >= self.capacidade:
+            with self.espaco:
+                self.espaco.wait_for(lambda: len(self.fila) < self.capacidade or self.erro is not None)
+        if self.erro is not None:
+            raise RuntimeError("O agregador de timestamps parou de gravar") from self.erro
+        self.fila.append(registro)
+
+    def aguardar_persistencia(self, timeout=None):
+        # Bloqueia até que tudo o que este produtor já enviou esteja no log em disco
+        alvo = self.tick_atual
+        with self.persistido:
+            persistido = self.persistido.wait_for(
+                lambda: self.tick_persistido >= alvo or self.erro is not None, timeout)
+        if self.erro is not None and self.tick_persistido < alvo:
+            raise RuntimeError("O agregador de timestamps parou de gravar") from self.erro
+        return persistido
+
+    def _agregar(self):
+        # Se a gravação falhar (disco cheio, erro de E/S...), produtores bloqueados e quem espera pela
+        # persistência são acordados com o erro
+        try:
+            self._agregar_ticks()
+        except Exception as erro:
+            self.erro = erro
+            with self.espaco:
+                self.espaco.notify_all()
+            with self.persistido:
+                self.persistido.notify_all()
+            raise
+
+    def _agregar_ticks(self):
+        proximo_tick = time.monotonic()
+        while self.rodando or self.fila:
+            proximo_tick += self.intervalo
+            espera = proximo_tick - time.monotonic()
+            if espera > 0:
+                time.sleep(espera)
+
+            tick = self.tick_atual
+            self.tick_atual += 1
+            pendentes = len(self.fila)
+            lote = [self.fila.popleft() for _ in range(pendentes)]
+            if pendentes:
+                with self.espaco:
+                    self.espaco.notify_all()
+                self._gravar_bloco(lote)
+
+            with self.persistido:
+                self.tick_persistido = tick
+                self.persistido.notify_all()
+
+    def _gravar_bloco(self, registros):
+        bloco = {
+            "indice": self.indice,
+            "relogio_ns": time.time_ns(),
+            "monotonico_ns": time.monotonic_ns(),
+            "hash_anterior": self.hash_anterior,
+            "registros": registros,
+        }
+        linha = json.dumps(bloco, separators=(",", ":"))
+        bloco_hash = hashlib.sha256(linha.encode()).hexdigest()
+        # Group commit: um write e um fsync para o bloco inteiro
+        self.log.write(f'{{"hash":"{bloco_hash}","bloco":{linha}}}\n'.encode())
+        self.log.flush()
+        os.fsync(self.log.fileno())
+        self.indice += 1
+        self.hash_anterior = bloco_hash
+
+
+def _ultimo_bloco(caminho):
+    # Retorna (fim da última linha íntegra, sua entrada), lendo o log de trás para frente sem percorrê-lo todo
+    with open(caminho, "rb") as arquivo:
+        if os.fstat(arquivo.fileno()).st_size == 0:
+            return 0, None
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            fim = mapa.rfind(b"\n") + 1
+            while fim:
+                inicio = mapa.rfind(b"\n", 0, fim - 1) + 1
+                try:
+                    return fim, json.loads(mapa[inicio:fim])
+                except ValueError:
+                    fim = inicio
+    return 0, None
+
+
+def ler_log(caminho):
+    # Relê o log e confere o encadeamento; retorna a lista de blocos. Uma última linha incompleta (queda no
+    # meio da escrita) é ignorada, como em iniciar; corrupção antes dela é erro
+    blocos = []
+    hash_anterior = "0"
+    with open(caminho, "rb") as arquivo:
+        for linha in arquivo:
+            if not linha.endswith(b"\n"):
+                break
+            try:
+                entrada = json.loads(linha)
+            except ValueError:
+                if arquivo.read(1):
+                    raise ValueError(f"Log corrompido depois do bloco {len(blocos) - 1}") from None
+                break
+            bloco = entrada["bloco"]
+            linha_bloco = json.dumps(bloco, separators=(",", ":"))
+            if bloco["hash_anterior"] != hash_anterior or hashlib.sha256(linha_bloco.encode()).hexdigest() != entrada["hash"]:
+                raise ValueError(f"Log corrompido no bloco {bloco['indice']}")
+            hash_anterior = entrada["hash"]
+            blocos.append(bloco)
+    return blocos
+
+
+def produtor(agregador, identificador, quantidade):
+    for i in range(quantidade):
+        agregador.enviar(f"p{identificador}:{i}")
+    agregador.aguardar_persistencia()
+
+
+if __name__ == "__main__":
+    num_produtores, por_produtor = 4, 250_000
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "timestamps.log")
+        agregador = AgregadorDeTimestamps(caminho)
+        agregador.iniciar()
+
+        inicio = time.perf_counter()
+        threads = [threading.Thread(target=produtor, args=(agregador, p, por_produtor)) for p in range(num_produtores)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        duracao = time.perf_counter() - inicio
+        agregador.parar()
+
+        total = num_produtores * por_produtor
+        print(f"{total} registros persistidos em {duracao:.2f}s ({total / duracao:,.0f} registros/s)")
+
+        blocos = ler_log(caminho)
+        ultimos = {}
+        ordenado = True
+        for bloco in blocos:
+            for registro in bloco["registros"]:
+                p, i = registro[1:].split(":")
+                ordenado &= int(i) == ultimos.get(p, -1) + 1
+                ultimos[p] = int(i)
+        print(f"{len(blocos)} blocos (group commits), encadeamento válido, "
+              f"ordem por produtor preservada: {ordenado}")
+
+        # Queda no meio de uma escrita e reinício: o bloco cortado é descartado e a cadeia continua
+        with open(caminho, "ab") as arquivo:
+            arquivo.write(b'{"hash":"12ab","bloco":{"indice":')
+        print(f"Log com bloco cortado: {len(ler_log(caminho))} blocos lidos")
+        agregador = AgregadorDeTimestamps(caminho)
+        agregador.iniciar()
+        for i in range(1000):
+            agregador.enviar(f"reinicio:{i}")
+        agregador.aguardar_persistencia()
+        agregador.parar()
+        blocos_depois = ler_log(caminho)
+        print(f"Depois do reinício: {len(blocos_depois)} blocos, encadeamento válido, primeiro bloco novo com "
+              f"índice {blocos_depois[len(blocos)]['indice']}")
@@ -0,0 +1,238 @@
+# Este código implementa Chaumian Cash de verdade, com assinaturas cegas RSA usando apenas inteiros do Python.
+# O portador cega o hash da nota (valor e número de série) com um fator aleatório r^e, o banco (mint) assina sem
+# ver a nota, e o portador remove o fator obtendo uma assinatura RSA válida que o banco não consegue associar
+# à emissão. Cada valor de nota tem sua própria chave, já que o banco não vê o que assina.
+# A assinatura usa o Teorema Chinês do Resto (CRT), cerca de 3x mais rápida que m^d mod n, os fatores de
+# cegamento vêm de um pool pré-calculado e o resgate verifica milhares de notas de uma vez por triagem em lote
+# (produto das assinaturas com expoentes aleatórios), em partes de tamanho fixo: uma parte reprovada é verificada
+# nota a nota, e se muitas partes vêm sendo reprovadas o banco passa direto à verificação individual.
+# Para executar, não são necessárias bibliotecas externas, apenas o Python padrão.
+
+import hashlib
+import math
+import secrets
+import time
+
+E = 65537
+BITS_TRIAGEM = 16  # uma nota inválida passa pela triagem com probabilidade ~2^-15
+LOTE_MINIMO = 16   # abaixo disso a verificação individual é mais barata que o teste em lote
+TAMANHO_PARTE = 128
+# Uma parte custa ~60% da verificação individual no teste em lote, mais a individual se for reprovada: acima
+# desta fração de partes reprovadas, testar em lote deixa de compensar
+LIMIAR_REPROVACAO = 0.3
+
+
+def eh_provavel_primo(n, rodadas=40):
+    if n < 2:
+        return False
+    for p in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for _ in range(rodadas):
+        x = pow(secrets.randbelow(n - 3) + 2, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def gerar_primo(bits):
+    while True:
+        candidato = secrets.randbits(bits) | (1 << (bits - 1)) | 1
+        if math.gcd(candidato - 1, E) == 1 and eh_provavel_primo(candidato):
+            return candidato
+
+
+class ChaveRSA:
+    def __init__(self, bits=2048):
+        p = gerar_primo(bits // 2)
+        q = gerar_primo(bits // 2)
+        while q == p:
+            q = gerar_primo(bits // 2)
+        self.n = p * q
+        self.e = E
+        d = pow(E, -1, (p - 1) * (q - 1))
+        # Parâmetros do CRT
+        self.p, self.q = p, q
+        self.dp, self.dq = d % (p - 1), d % (q - 1)
+        self.q_inv = pow(q, -1, p)
+
+    def assinar(self, m):
+        # m^d mod n via CRT (recombinação de Garner)
+        sp = pow(m % self.p, self.dp, self.p)
+        sq = pow(m % self.q, self.dq, self.q)
+        h = self.q_inv * (sp - sq) % self.p
+        return sq + h * self.q
+
+
+def multi_exponenciacao(bases, expoentes, n):
+    # prod bases[i]^expoentes[i] mod n pelo método dos baldes (Pippenger): custa cerca de
+    # (len(bases) + 2 * 2^janela) multiplicações por janela, em vez de uma exponenciação por base
+    janela = max(2, min(8, len(bases).bit_length() - 3))
+    mascara = (1 << janela) - 1
+    num_janelas = (max(expoentes, default=0).bit_length() + janela - 1) // janela
+    resultado = 1
+    for w in reversed(range(num_janelas)):
+        for _ in range(janela):
+            resultado = resultado * resultado % n
+        baldes = [1] * (mascara + 1)
+        deslocamento = w * janela
+        for base, expoente in zip(bases, expoentes):
+            digito = (expoente >> deslocamento) & mascara
+            if digito:
+                baldes[digito] = baldes[digito] * base % n
+        # prod baldes[d]^d = produto dos produtos parciais acumulados de cima para baixo
+        acumulado = soma = 1
+        for digito in range(mascara, 0, -1):
+            acumulado = acumulado * baldes[digito] % n
+            soma = soma * acumulado % n
+        resultado = resultado * soma % n
+    return resultado
+
+
+def hash_para_inteiro(mensagem, n):
+    # Full Domain Hash: expande o SHA-256 em modo contador até o tamanho do módulo
+    tamanho = (n.bit_length() + 7) // 8
+    saida = b"".join(hashlib.sha256(i.to_bytes(4, "big") + mensagem).digest()
+                     for i in range((tamanho + 31) // 32))
+    return int.from_bytes(saida[:tamanho], "big") % n
+
+
+class DigitalNote:
+    def __init__(self, value, serial_number=None, signature=None):
+        self.value = value
+        self.serial_number = serial_number or secrets.token_hex(16)
+        self.signature = signature
+
+    def mensagem(self):
+        return f"{self.value}:{self.serial_number}".encode()
+
+
+class Mint:
+    def __init__(self, valores, bits=2048):
+        self.chaves = {valor: ChaveRSA(bits) for valor in valores}
+        self.taxa_reprovacao = {valor: 0.0 for valor in valores}  # média móvel das partes com notas inválidas
+
+    def chave_publica(self, valor):
+        chave = self.chaves[valor]
+        return chave.n, chave.e
+
+    def assinar_cego(self, valor, mensagem_cega):
+        # O banco debita o valor da conta do cliente e assina sem ver a nota
+        return self.chaves[valor].assinar(mensagem_cega)
+
+    def verificar_lote(self, notas):
+        # Retorna a lista de notas inválidas; as válidas passam por um único teste em lote por valor
+        invalidas = []
+        por_valor = {}
+        for nota in notas:
+            por_valor.setdefault(nota.value, []).append(nota)
+        for valor, grupo in por_valor.items():
+            if valor not in self.chaves:
+                invalidas.extend(grupo)
+                continue
+            n, e = self.chave_publica(valor)
+            # Cada hash é calculado uma única vez e reaproveitado pelo teste em lote e pela verificação individual
+            hashes = [hash_para_inteiro(nota.mensagem(), n) for nota in grupo]
+            for inicio in range(0, len(grupo), TAMANHO_PARTE):
+                fim = inicio + TAMANHO_PARTE
+                invalidas.extend(self._triagem(valor, grupo[inicio:fim], hashes[inicio:fim], n, e))
+        return invalidas
+
+    def _triagem(self, valor, notas, hashes, n, e):
+        # Teste em lote com expoentes aleatórios pequenos: (prod s_i^r_i)^e == prod H_i^r_i (mod n).
+        # Sem os r_i, duas assinaturas falsas s1*c e s2/c se cancelariam no produto. Uma parte reprovada não é
+        # subdividida: é verificada nota a nota, então notas falsas espalhadas custam no máximo um teste em lote
+        # a mais por parte, e quem as espalha em todas as partes leva o banco à verificação individual.
+        taxa = self.taxa_reprovacao[valor]
+        if len(notas) > LOTE_MINIMO and taxa <= LIMIAR_REPROVACAO:
+            expoentes = [secrets.randbits(BITS_TRIAGEM) | 1 for _ in notas]
+            assinaturas = [nota.signature or 0 for nota in notas]
+            if pow(multi_exponenciacao(assinaturas, expoentes, n), e, n) == multi_exponenciacao(hashes, expoentes, n):
+                self.taxa_reprovacao[valor] = 0.75 * taxa
+                return []
+        invalidas = [nota for nota, h in zip(notas, hashes) if pow(nota.signature or 0, e, n) != h]
+        # A verificação individual também informa se a parte teria sido reprovada, então a taxa volta a cair
+        # sozinha quando as notas inválidas param de chegar
+        if len(notas) > LOTE_MINIMO:
+            self.taxa_reprovacao[valor] = 0.75 * taxa + 0.25 * bool(invalidas)
+        return invalidas
+
+
+class Carteira:
+    def __init__(self, mint, tamanho_pool=256):
+        self.mint = mint
+        self.tamanho_pool = tamanho_pool
+        self.pools = {}
+
+    def _fator_de_cegamento(self, valor):
+        # Pool de pares (r^e mod n, r^-1 mod n) calculados antecipadamente, fora do caminho da emissão
+        pool = self.pools.setdefault(valor, [])
+        if not pool:
+            n, e = self.mint.chave_publica(valor)
+            while len(pool) < self.tamanho_pool:
+                r = secrets.randbelow(n - 2) + 2
+                if math.gcd(r, n) == 1:
+                    pool.append((pow(r, e, n), pow(r, -1, n)))
+        return pool.pop()
+
+    def sacar(self, valor):
+        n, _ = self.mint.chave_publica(valor)
+        nota = DigitalNote(valor)
+        r_e, r_inv = self._fator_de_cegamento(valor)
+        mensagem_cega = hash_para_inteiro(nota.mensagem(), n) * r_e % n
+        assinatura_cega = self.mint.assinar_cego(valor, mensagem_cega)
+        nota.signature = assinatura_cega * r_inv % n  # remove o cegamento
+        return nota
+
+
+if __name__ == "__main__":
+    bits = 2048
+    inicio = time.perf_counter()
+    mint = Mint([10, 100], bits=bits)
+    print(f"Chaves RSA de {bits} bits geradas em {time.perf_counter() - inicio:.1f}s")
+    carteira = Carteira(mint)
+
+    # Criando uma nota digital de valor 100
+    note = carteira.sacar(100)
+    print(f"Nota Digital: {note.value}, Serial: {note.serial_number}, Assinatura: {hex(note.signature)[:34]}...")
+    is_valid = not mint.verificar_lote([note])
+    print(f"Validação da assinatura: {'Válida' if is_valid else 'Inválida'}")
+
+    # Emissão: inclui a assinatura CRT e o pool de cegamento
+    quantidade = 800
+    inicio = time.perf_counter()
+    notas = [carteira.sacar(100) for _ in range(quantidade)]
+    emissao = quantidade / (time.perf_counter() - inicio)
+
+    def vazao(verificar):
+        inicio = time.perf_counter()
+        invalidas = verificar(notas)
+        return len(invalidas), quantidade / (time.perf_counter() - inicio)
+
+    def verificar_individual(lote):
+        n = mint.chaves[100].n
+        return [nota for nota in lote if pow(nota.signature, E, n) != hash_para_inteiro(nota.mensagem(), n)]
+
+    print(f"Emissão: {emissao:,.0f} notas/s por núcleo")
+    print("Resgate em lote: %d inválidas, %.0f notas/s" % vazao(mint.verificar_lote))
+    print("Resgate individual: %d inválidas, %.0f notas/s" % vazao(verificar_individual))
+
+    # Duas notas falsificadas no meio do lote
+    notas[100].signature += 1
+    notas[601] = DigitalNote(100, signature=notas[599].signature)
+    print("Resgate em lote com falsificações: %d inválidas, %.0f notas/s" % vazao(mint.verificar_lote))
+
+    # Ataque: uma nota falsa em cada parte; depois de poucas partes reprovadas o banco verifica nota a nota
+    for i in range(0, quantidade, TAMANHO_PARTE):
+        notas[i].signature += 1
+    print("Resgate com uma falsificação por parte: %d inválidas, %.0f notas/s" % vazao(mint.verificar_lote))
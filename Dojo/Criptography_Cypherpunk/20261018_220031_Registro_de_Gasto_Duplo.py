@@ -0,0 +1,383 @@
+# Este código impede o gasto duplo de notas digitais do Chaumian Cash.
+# Os números de série passam a ter 128 bits gerados com o módulo `secrets` (colisões praticamente impossíveis),
+# e o banco mantém um registro dos números já gastos, dividido em shards. Em cada shard, um filtro de Bloom
+# responde à maioria das consultas de notas não gastas sem tocar no armazenamento; atrás dele há uma memtable
+# (conjunto em memória, protegida por um log de escrita antecipada) que é despejada em segmentos ordenados em
+# disco, consultados por busca binária via mmap. Os segmentos são compactados por camadas: só segmentos de
+# tamanho parecido são intercalados, numa thread à parte, sem segurar a trava do shard.
+# O "verificar e inserir" é atômico por shard, seguro entre threads, e só confirma um resgate depois do fsync.
+# A cada despejo, o vetor de bits do filtro de Bloom é salvo ao lado dos segmentos; ao reabrir o diretório, a chave,
+# os segmentos, o filtro e o log são carregados, e só os seriais do log precisam ser calculados de novo.
+# Para executar, não são necessárias bibliotecas externas, apenas o Python padrão.
+
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import secrets
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+TAMANHO_SERIAL = 16  # bytes
+TAMANHO_CHAVE = 16
+CONFIGURACAO = struct.Struct("<16sI")  # chave do hash, número de shards
+CABECALHO_FILTRO = struct.Struct("<QII")  # número de bits, número de hashes, CRC32 do vetor de bits
+FATOR_COMPACTACAO = 4  # quantos segmentos de uma mesma camada são intercalados em um só
+SERIAIS_POR_ESCRITA = 4096
+
+
+def _sincronizar_diretorio(diretorio):
+    fd = os.open(diretorio, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class DigitalNote:
+    def __init__(self, value):
+        self.value = value
+        self.serial_number = secrets.token_hex(TAMANHO_SERIAL)
+
+
+class FiltroDeBloom:
+    def __init__(self, capacidade, taxa_falsos_positivos=0.01):
+        self.num_bits = max(64, int(-capacidade * math.log(taxa_falsos_positivos) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacidade * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def adicionar(self, h1, h2):
+        # Liga as k posições (hashing duplo a partir de dois valores de 64 bits) e retorna True se todas
+        # já estavam ligadas, ou seja, se o elemento talvez já estivesse no filtro
+        bits, num_bits = self.bits, self.num_bits
+        presente = True
+        for i in range(self.num_hashes):
+            p = (h1 + i * h2) % num_bits
+            mascara = 1 << (p & 7)
+            if not bits[p >> 3] & mascara:
+                presente = False
+                bits[p >> 3] |= mascara
+        return presente
+
+    def gravar(self, caminho):
+        temporario = caminho + ".tmp"
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(CABECALHO_FILTRO.pack(self.num_bits, self.num_hashes, zlib.crc32(self.bits)))
+            arquivo.write(self.bits)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+        _sincronizar_diretorio(os.path.dirname(caminho))
+
+    @classmethod
+    def carregar(cls, caminho, capacidade, taxa_falsos_positivos=0.01):
+        # Retorna None se não houver filtro salvo, se ele foi criado com outros parâmetros ou estiver corrompido
+        filtro = cls(capacidade, taxa_falsos_positivos)
+        if not os.path.exists(caminho):
+            return None
+        with open(caminho, "rb") as arquivo:
+            conteudo = arquivo.read()
+        if len(conteudo) != CABECALHO_FILTRO.size + len(filtro.bits):
+            return None
+        num_bits, num_hashes, crc = CABECALHO_FILTRO.unpack_from(conteudo)
+        bits = conteudo[CABECALHO_FILTRO.size:]
+        if (num_bits, num_hashes) != (filtro.num_bits, filtro.num_hashes) or zlib.crc32(bits) != crc:
+            return None
+        filtro.bits[:] = bits
+        return filtro
+
+
+class Segmento:
+    # Arquivo com seriais de 16 bytes em ordem crescente, lido via mmap; imutável depois de gravado
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.arquivo = open(caminho, "rb")
+        self.tamanho = os.path.getsize(caminho) // TAMANHO_SERIAL
+        self.mapa = mmap.mmap(self.arquivo.fileno(), 0, access=mmap.ACCESS_READ) if self.tamanho else None
+
+    @classmethod
+    def gravar(cls, caminho, seriais_ordenados):
+        # Grava em um arquivo temporário, em blocos de vários seriais por write, e só então o renomeia:
+        # um segmento com o nome definitivo está sempre completo
+        temporario = caminho + ".tmp"
+        with open(temporario, "wb") as arquivo:
+            while True:
+                bloco = b"".join(islice(seriais_ordenados, SERIAIS_POR_ESCRITA))
+                if not bloco:
+                    break
+                arquivo.write(bloco)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+        _sincronizar_diretorio(os.path.dirname(caminho))
+        return cls(caminho)
+
+    def __iter__(self):
+        for i in range(self.tamanho):
+            yield self.mapa[i * TAMANHO_SERIAL:(i + 1) * TAMANHO_SERIAL]
+
+    def contem(self, serial):
+        baixo, alto = 0, self.tamanho
+        while baixo < alto:
+            meio = (baixo + alto) // 2
+            atual = self.mapa[meio * TAMANHO_SERIAL:(meio + 1) * TAMANHO_SERIAL]
+            if atual < serial:
+                baixo = meio + 1
+            elif atual > serial:
+                alto = meio
+            else:
+                return True
+        return False
+
+    def fechar(self, apagar=False):
+        if self.mapa is not None:
+            self.mapa.close()
+        self.arquivo.close()
+        if apagar:
+            os.remove(self.caminho)
+
+
+def _sem_repeticoes(seriais_ordenados):
+    # Após uma queda no meio da compactação, um serial pode estar no segmento novo e nos antigos
+    anterior = None
+    for serial in seriais_ordenados:
+        if serial != anterior:
+            yield serial
+            anterior = serial
+
+
+class Shard:
+    def __init__(self, diretorio, capacidade, limite_memtable, hashes, executor, sincronizar=True):
+        self.diretorio = diretorio
+        self.trava = threading.Lock()
+        self.memtable = set()
+        self.limite_memtable = limite_memtable
+        self.hashes = hashes          # serial -> (h1, h2) do filtro de Bloom
+        self.executor = executor      # onde rodam as compactações
+        self.sincronizar = sincronizar
+        self.compactando = False
+        self.encerrando = False
+        self.consultas_ao_armazenamento = 0
+
+        # Segmentos existentes (os .tmp são restos de uma gravação interrompida) e o log da memtable
+        numeros = []
+        for nome in os.listdir(diretorio):
+            if nome.endswith(".tmp"):
+                os.remove(os.path.join(diretorio, nome))
+            elif nome.startswith("segmento_"):
+                numeros.append(int(nome[len("segmento_"):-len(".dat")]))
+        numeros.sort()
+        self.segmentos = [Segmento(self._caminho(numero)) for numero in numeros]
+        self.proximo_segmento = numeros[-1] if numeros else 0
+        # O filtro salvo cobre todos os segmentos, pois é gravado depois de cada um; só um diretório sem ele (ou
+        # de outra capacidade) exige recalcular o hash de cada serial
+        self.caminho_filtro = os.path.join(diretorio, "filtro.dat")
+        self.bloom = FiltroDeBloom.carregar(self.caminho_filtro, capacidade)
+        if self.bloom is None:
+            self.bloom = FiltroDeBloom(capacidade)
+            for segmento in self.segmentos:
+                for serial in segmento:
+                    self.bloom.adicionar(*hashes(serial))
+
+        caminho_log = os.path.join(diretorio, "memtable.log")
+        if os.path.exists(caminho_log):
+            with open(caminho_log, "rb") as arquivo:
+                conteudo = arquivo.read()
+            # Um serial incompleto no fim (queda durante a escrita) nunca foi confirmado
+            for i in range(0, len(conteudo) - TAMANHO_SERIAL + 1, TAMANHO_SERIAL):
+                serial = conteudo[i:i + TAMANHO_SERIAL]
+                self.memtable.add(serial)
+                self.bloom.adicionar(*hashes(serial))
+        self.log = open(caminho_log, "ab")
+        self.log.truncate(os.path.getsize(caminho_log) // TAMANHO_SERIAL * TAMANHO_SERIAL)
+        _sincronizar_diretorio(diretorio)
+
+    def _caminho(self, numero):
+        return os.path.join(self.diretorio, f"segmento_{numero:08d}.dat")
+
+    def _contem(self, serial):
+        if serial in self.memtable:
+            return True
+        self.consultas_ao_armazenamento += 1
+        # Segmentos mais novos primeiro
+        return any(segmento.contem(serial) for segmento in reversed(self.segmentos))
+
+    def verificar_e_inserir(self, itens):
+        # itens: lista de (serial, h1, h2). Retorna, para cada um, True se a nota foi resgatada agora e False
+        # se é gasto duplo. Os resgates aceitos entram no log e são persistidos com um único fsync (group commit)
+        # antes de a trava ser liberada, então nenhum resgate é confirmado sem estar no disco.
+        resultados = []
+        with self.trava:
+            for serial, h1, h2 in itens:
+                if self.bloom.adicionar(h1, h2) and self._contem(serial):
+                    resultados.append(False)
+                    continue
+                self.memtable.add(serial)
+                self.log.write(serial)
+                resultados.append(True)
+                if len(self.memtable) >= self.limite_memtable:
+                    self._despejar()
+            self.log.flush()
+            if self.sincronizar:
+                os.fsync(self.log.fileno())
+        return resultados
+
+    def _despejar(self):
+        self.proximo_segmento += 1
+        self.segmentos.append(Segmento.gravar(self._caminho(self.proximo_segmento), iter(sorted(self.memtable))))
+        # Filtro e segmento já estão no disco: o log da memtable pode ser esvaziado. Numa queda antes disso, o
+        # log ainda tem os seriais que faltam no filtro salvo e eles são reaplicados na abertura
+        self.bloom.gravar(self.caminho_filtro)
+        self.memtable = set()
+        self.log.flush()
+        self.log.truncate(0)
+        os.fsync(self.log.fileno())
+        self._agendar_compactacao()
+
+    def _camada(self, segmento):
+        # Camada c: segmentos com entre limite * FATOR^c e limite * FATOR^(c+1) seriais
+        camada, tamanho = 0, self.limite_memtable * FATOR_COMPACTACAO
+        while segmento.tamanho >= tamanho:
+            camada += 1
+            tamanho *= FATOR_COMPACTACAO
+        return camada
+
+    def _agendar_compactacao(self):
+        # Chamado com a trava: escolhe FATOR segmentos da mesma camada e os intercala fora da trava.
+        # Cada serial é regravado uma vez por camada, O(log n) vezes no total, em vez de a cada compactação.
+        if self.compactando or self.encerrando:
+            return
+        camadas = {}
+        for segmento in self.segmentos:
+            camadas.setdefault(self._camada(segmento), []).append(segmento)
+        for camada in sorted(camadas):
+            if len(camadas[camada]) >= FATOR_COMPACTACAO:
+                self.compactando = True
+                self.proximo_segmento += 1
+                self.executor.submit(self._compactar, camadas[camada][:FATOR_COMPACTACAO], self.proximo_segmento)
+                return
+
+    def _compactar(self, antigos, numero):
+        # Os segmentos são imutáveis, então podem ser lidos sem a trava enquanto novos resgates chegam
+        novo = Segmento.gravar(self._caminho(numero), _sem_repeticoes(heapq.merge(*antigos)))
+        with self.trava:
+            self.segmentos = [segmento for segmento in self.segmentos if segmento not in antigos] + [novo]
+            self.segmentos.sort(key=lambda segmento: segmento.caminho)
+            for segmento in antigos:
+                segmento.fechar(apagar=True)
+            _sincronizar_diretorio(self.diretorio)
+            self.compactando = False
+            self._agendar_compactacao()
+
+    def fechar(self):
+        self.log.close()
+        for segmento in self.segmentos:
+            segmento.fechar()
+
+
+class RegistroDeGastos:
+    def __init__(self, diretorio, num_shards=64, capacidade=10_000_000, limite_memtable=100_000, sincronizar=True):
+        os.makedirs(diretorio, exist_ok=True)
+        # A chave do hash (impede escolher seriais que colidam no filtro) e o número de shards são fixos para o
+        # diretório: sem eles, os seriais iriam para outros shards e o filtro não poderia ser reconstruído
+        caminho_configuracao = os.path.join(diretorio, "configuracao.dat")
+        if os.path.exists(caminho_configuracao):
+            with open(caminho_configuracao, "rb") as arquivo:
+                self.chave, shards_gravados = CONFIGURACAO.unpack(arquivo.read(CONFIGURACAO.size))
+            if shards_gravados != num_shards:
+                raise ValueError(f"{diretorio} foi criado com {shards_gravados} shards, não {num_shards}")
+        else:
+            self.chave = secrets.token_bytes(TAMANHO_CHAVE)
+            with open(caminho_configuracao + ".tmp", "wb") as arquivo:
+                arquivo.write(CONFIGURACAO.pack(self.chave, num_shards))
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+            os.replace(caminho_configuracao + ".tmp", caminho_configuracao)
+            _sincronizar_diretorio(diretorio)
+
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.shards = []
+        for i in range(num_shards):
+            pasta = os.path.join(diretorio, f"shard_{i:03d}")
+            os.makedirs(pasta, exist_ok=True)
+            self.shards.append(Shard(pasta, capacidade // num_shards + 1, limite_memtable,
+                                     self._hashes_do_filtro, self.executor, sincronizar))
+
+    def _hash(self, serial):
+        return hashlib.blake2b(serial, key=self.chave, digest_size=24).digest()
+
+    def _hashes_do_filtro(self, serial):
+        h = self._hash(serial)
+        return int.from_bytes(h[:8], "little"), int.from_bytes(h[8:16], "little") | 1
+
+    def resgatar_lote(self, serial_numbers):
+        # Agrupa por shard para que cada shard faça um único fsync pelo lote inteiro
+        por_shard = {}
+        for posicao, serial_number in enumerate(serial_numbers):
+            serial = bytes.fromhex(serial_number)
+            h = self._hash(serial)
+            item = (serial, int.from_bytes(h[:8], "little"), int.from_bytes(h[8:16], "little") | 1)
+            indice = int.from_bytes(h[16:], "little") % len(self.shards)
+            posicoes, itens = por_shard.setdefault(indice, ([], []))
+            posicoes.append(posicao)
+            itens.append(item)
+        resultados = [False] * len(serial_numbers)
+        for indice, (posicoes, itens) in por_shard.items():
+            for posicao, aceito in zip(posicoes, self.shards[indice].verificar_e_inserir(itens)):
+                resultados[posicao] = aceito
+        return resultados
+
+    def resgatar(self, serial_number):
+        return self.resgatar_lote([serial_number])[0]
+
+    def consultas_ao_armazenamento(self):
+        return sum(shard.consultas_ao_armazenamento for shard in self.shards)
+
+    def fechar(self):
+        for shard in self.shards:
+            with shard.trava:
+                shard.encerrando = True
+        self.executor.shutdown(wait=True)  # termina as compactações em andamento
+        for shard in self.shards:
+            shard.fechar()
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as diretorio:
+        registro = RegistroDeGastos(diretorio, num_shards=16, capacidade=2_000_000, limite_memtable=20_000)
+
+        # Criando e resgatando uma nota digital de valor 100
+        note = DigitalNote(100)
+        print(f"Nota Digital: {note.value}, Serial: {note.serial_number}")
+        print(f"Primeiro resgate: {'aceito' if registro.resgatar(note.serial_number) else 'recusado'}")
+        print(f"Segundo resgate: {'aceito' if registro.resgatar(note.serial_number) else 'recusado (gasto duplo)'}")
+
+        # Resgates concorrentes de 1 milhão de notas em lotes de 1000, com 1% de tentativas de gasto duplo
+        seriais = [secrets.token_hex(TAMANHO_SERIAL) for _ in range(1_000_000)]
+        tentativas = seriais + seriais[::100]
+        lotes = [tentativas[i:i + 1000] for i in range(0, len(tentativas), 1000)]
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            resultados = [aceito for lote in executor.map(registro.resgatar_lote, lotes) for aceito in lote]
+        duracao = time.perf_counter() - inicio
+
+        print(f"{len(tentativas)} resgates em {duracao:.2f}s ({len(tentativas) / duracao:,.0f}/s): "
+              f"{resultados.count(False)} gastos duplos recusados")
+        print(f"Consultas que passaram do filtro de Bloom: {registro.consultas_ao_armazenamento()} "
+              f"({registro.consultas_ao_armazenamento() / len(tentativas):.2%})")
+        registro.fechar()
+
+        # Reabertura: segmentos, memtable e chave vêm do disco, e nada do que foi gasto volta a valer
+        inicio = time.perf_counter()
+        registro = RegistroDeGastos(diretorio, num_shards=16, capacidade=2_000_000, limite_memtable=20_000)
+        print(f"Registro reaberto em {time.perf_counter() - inicio:.2f}s; segmentos por shard: "
+              f"{[len(shard.segmentos) for shard in registro.shards]}")
+        amostra = seriais[::1000] + [note.serial_number]
+        print(f"Notas já gastas aceitas após reabrir: {sum(registro.resgatar_lote(amostra))} de {len(amostra)}")
+        registro.fechar()
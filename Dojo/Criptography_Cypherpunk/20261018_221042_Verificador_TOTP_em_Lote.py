@@ -0,0 +1,182 @@
+# Este código implementa um serviço de verificação de TOTP (RFC 6238) para milhares a milhões de usuários,
+# sem o `pyotp`. Para cada segredo, o estado do HMAC (os hashes internos e externos já alimentados com a chave
+# XOR ipad/opad) é calculado uma única vez no cadastro; cada código custa então só duas compressões SHA-1.
+# A verificação em lote aceita uma janela de ±N passos, empacota cada passo de tempo uma única vez por lote e
+# reaproveita os códigos já calculados para o mesmo usuário. Um código só é aceito uma vez: o último passo usado
+# de cada usuário é guardado, e passos iguais ou anteriores são recusados (proteção contra replay).
+# A ressincronização procura, numa janela ampla, o deslocamento em que dois códigos consecutivos batem, e passa a
+# centrar a janela do usuário nesse desvio de relógio. Para executar, apenas o Python padrão é necessário.
+
+import base64
+import hashlib
+import hmac
+import secrets
+import struct
+import time
+
+PASSO = 30  # segundos
+DIGITOS = 6
+TAMANHO_BLOCO = 64  # bloco do SHA-1
+IPAD = bytes(x ^ 0x36 for x in range(256))
+OPAD = bytes(x ^ 0x5C for x in range(256))
+
+
+def estado_hmac(chave):
+    # Hashes interno e externo do HMAC-SHA1 já alimentados com a chave; basta copiá-los para cada mensagem
+    if len(chave) > TAMANHO_BLOCO:
+        chave = hashlib.sha1(chave).digest()
+    chave = chave.ljust(TAMANHO_BLOCO, b"\0")
+    return hashlib.sha1(chave.translate(IPAD)), hashlib.sha1(chave.translate(OPAD))
+
+
+def codigo(estado, mensagem):
+    # HOTP (RFC 4226) a partir do estado pré-calculado e do contador já empacotado
+    interno, externo = estado
+    h = interno.copy()
+    h.update(mensagem)
+    o = externo.copy()
+    o.update(h.digest())
+    digest = o.digest()
+    deslocamento = digest[19] & 0x0F
+    valor = struct.unpack_from(">I", digest, deslocamento)[0] & 0x7FFFFFFF
+    return f"{valor % 10 ** DIGITOS:0{DIGITOS}d}"
+
+
+def bem_formado(codigo_recebido):
+    # Só uma str de DIGITOS dígitos ASCII pode ser um código; qualquer outra coisa é recusada antes do
+    # compare_digest, que levantaria TypeError e interromperia o lote no meio
+    return (isinstance(codigo_recebido, str) and codigo_recebido.isascii() and codigo_recebido.isdigit()
+            and len(codigo_recebido) == DIGITOS)
+
+
+class VerificadorTOTP:
+    def __init__(self, janela=1, janela_ressincronizacao=100):
+        self.janela = janela
+        self.janela_ressincronizacao = janela_ressincronizacao
+        self.estados = {}       # usuário -> estado do HMAC
+        self.ultimo_passo = {}  # usuário -> último passo aceito (replay)
+        self.deriva = {}        # usuário -> desvio de relógio em passos, obtido na ressincronização
+        # Ordem de teste da janela: passo atual primeiro, depois os vizinhos mais próximos
+        self.deslocamentos = sorted(range(-janela, janela + 1), key=abs)
+
+    def cadastrar(self, usuario, segredo_base32):
+        self.estados[usuario] = estado_hmac(base64.b32decode(segredo_base32, casefold=True))
+
+    def remover(self, usuario):
+        for tabela in (self.estados, self.ultimo_passo, self.deriva):
+            tabela.pop(usuario, None)
+
+    def verificar_lote(self, pares, agora=None):
+        # pares: lista de (usuário, código); retorna uma lista de booleanos na mesma ordem. Um código malformado
+        # é só recusado, e o último passo só muda para os pares aceitos
+        passo_atual = int((time.time() if agora is None else agora) // PASSO)
+        mensagens = {}  # passo -> contador empacotado, calculado uma vez por lote
+        codigos = {}    # (usuário, passo) -> código em bytes, para usuários repetidos no lote
+        resultados = []
+        for usuario, recebido in pares:
+            estado = self.estados.get(usuario)
+            aceito = False
+            if estado is not None and bem_formado(recebido):
+                recebido = recebido.encode()
+                centro = passo_atual + self.deriva.get(usuario, 0)
+                ultimo = self.ultimo_passo.get(usuario, -1)
+                for d in self.deslocamentos:
+                    passo = centro + d
+                    if passo <= ultimo:
+                        continue
+                    chave = (usuario, passo)
+                    esperado = codigos.get(chave)
+                    if esperado is None:
+                        mensagem = mensagens.get(passo)
+                        if mensagem is None:
+                            mensagem = mensagens[passo] = struct.pack(">Q", passo)
+                        esperado = codigos[chave] = codigo(estado, mensagem).encode()
+                    if hmac.compare_digest(esperado, recebido):
+                        self.ultimo_passo[usuario] = passo
+                        aceito = True
+                        break
+            resultados.append(aceito)
+        return resultados
+
+    def verificar(self, usuario, codigo_recebido, agora=None):
+        return self.verificar_lote([(usuario, codigo_recebido)], agora)[0]
+
+    def ressincronizar(self, usuario, codigo1, codigo2, agora=None):
+        # Procura o deslocamento em que codigo1 e codigo2 são os códigos de dois passos consecutivos, do mais
+        # próximo ao mais distante do relógio do servidor; retorna o desvio encontrado ou None.
+        # `agora` deve ser o instante em que codigo2 foi gerado (o usuário digita os dois códigos seguidos,
+        # e codigo1 é o do passo anterior): o desvio é medido entre o passo de codigo2 e o passo de `agora`.
+        estado = self.estados[usuario]
+        if not (bem_formado(codigo1) and bem_formado(codigo2)):
+            return None
+        passo_atual = int((time.time() if agora is None else agora) // PASSO)
+        ultimo = self.ultimo_passo.get(usuario, -1)
+        limite = self.janela_ressincronizacao
+        for d in sorted(range(-limite, limite + 1), key=abs):
+            passo = passo_atual + d
+            if passo <= ultimo:
+                continue
+            if (hmac.compare_digest(codigo(estado, struct.pack(">Q", passo)), codigo1)
+                    and hmac.compare_digest(codigo(estado, struct.pack(">Q", passo + 1)), codigo2)):
+                self.deriva[usuario] = d + 1
+                self.ultimo_passo[usuario] = passo + 1
+                return d + 1
+        return None
+
+
+def totp_referencia(segredo_base32, instante):
+    # Implementação direta com hmac.new, usada só para conferir o verificador
+    chave = base64.b32decode(segredo_base32, casefold=True)
+    digest = hmac.new(chave, struct.pack(">Q", int(instante // PASSO)), hashlib.sha1).digest()
+    deslocamento = digest[19] & 0x0F
+    valor = int.from_bytes(digest[deslocamento:deslocamento + 4], "big") & 0x7FFFFFFF
+    return f"{valor % 10 ** DIGITOS:0{DIGITOS}d}"
+
+
+if __name__ == "__main__":
+    verificador = VerificadorTOTP(janela=1)
+
+    # O segredo do exemplo original e o vetor de teste da RFC 6238 (SHA-1, T = 59s -> 94287082 com 8 dígitos)
+    secret = "JBSWY3DPEHPK3PXP"
+    verificador.cadastrar("alice", secret)
+    agora = time.time()
+    print("Senha TOTP atual:", totp_referencia(secret, agora))
+    print("Verificação:", verificador.verificar("alice", totp_referencia(secret, agora), agora))
+    print("Mesmo código de novo (replay):", verificador.verificar("alice", totp_referencia(secret, agora), agora))
+    print("Lote com códigos malformados:", verificador.verificar_lote(
+        [("alice", "12345٦"), ("alice", 123456), ("alice", "1234567"), ("alice", totp_referencia(secret, agora + PASSO))],
+        agora))
+    rfc = base64.b32encode(b"12345678901234567890").decode()
+    print("Vetor da RFC 6238:", totp_referencia(rfc, 59), "(esperado 287082)")
+
+    # Um relógio adiantado 10 minutos (20 passos): fora da janela até a ressincronização. Mesmo sem tolerância
+    # (janela=0), o código seguinte é aceito depois dela
+    exato = VerificadorTOTP(janela=0)
+    exato.cadastrar("bob", secret)
+    adiantado = agora + 600
+    print("Relógio adiantado, antes da ressincronização:",
+          exato.verificar("bob", totp_referencia(secret, adiantado), agora))
+    desvio = exato.ressincronizar("bob", totp_referencia(secret, adiantado - PASSO),
+                                  totp_referencia(secret, adiantado), agora)
+    print(f"Ressincronizado com desvio de {desvio} passos; próximo código aceito:",
+          exato.verificar("bob", totp_referencia(secret, adiantado + PASSO), agora + PASSO))
+
+    # Rajada de login: 200 mil usuários, 10% com código errado (pior caso: testa a janela inteira)
+    num_usuarios = 200_000
+    segredos = [base64.b32encode(secrets.token_bytes(20)).decode() for _ in range(num_usuarios)]
+    inicio = time.perf_counter()
+    for i, segredo in enumerate(segredos):
+        verificador.cadastrar(i, segredo)
+    print(f"{num_usuarios} segredos cadastrados em {time.perf_counter() - inicio:.2f}s")
+
+    pares = []
+    for i, segredo in enumerate(segredos):
+        correto = totp_referencia(segredo, agora + PASSO * (i % 3 - 1))  # relógios a -1, 0 e +1 passo
+        pares.append((i, correto if i % 10 else f"{(int(correto) + 1) % 10 ** DIGITOS:0{DIGITOS}d}"))
+
+    inicio = time.perf_counter()
+    resultados = verificador.verificar_lote(pares, agora)
+    duracao = time.perf_counter() - inicio
+    esperados = sum(1 for i in range(num_usuarios) if i % 10)
+    print(f"{len(pares)} verificações em {duracao:.2f}s ({len(pares) / duracao:,.0f}/s em um núcleo): "
+          f"{sum(resultados)} aceitas (esperado {esperados})")
@@ -0,0 +1,203 @@
+# Este código implementa um registro de "Dead Man Switches" capaz de manter milhões de interruptores em um único
+# processo. Em vez de uma thread dormindo por interruptor, cada um tem o seu próprio prazo e todos ficam numa roda
+# de tempo hierárquica (como os timers do kernel Linux), movida por uma única thread de eventos.
+# O check-in é O(1): só atualiza o prazo do interruptor, sem mexer na roda. Quando a posição antiga vence, a roda
+# percebe que o prazo foi adiado e o reinsere (reagendamento preguiçoso). Cada nível tem 64 posições; os níveis
+# de cima são redistribuídos para os de baixo quando o contador de ticks passa por eles, então inserir, vencer e
+# reinserir custam O(1) amortizado. As ações de emergência rodam em lotes num pool de threads, fora da thread da roda.
+# O código usa apenas bibliotecas que já vêm instaladas com Python.
+
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BITS_POR_NIVEL = 6
+POSICOES = 1 << BITS_POR_NIVEL
+MASCARA = POSICOES - 1
+NIVEIS = 4  # 64^4 ticks: mais de 46 horas com ticks de 10 ms; prazos além disso esperam numa lista à parte
+TAMANHO_LOTE = 1000  # ações por tarefa enviada ao pool
+
+
+class Interruptor:
+    __slots__ = ("identificador", "intervalo", "prazo", "acao", "ativo")
+
+    def __init__(self, identificador, intervalo, prazo, acao):
+        self.identificador = identificador
+        self.intervalo = intervalo  # em ticks
+        self.prazo = prazo          # tick em que dispara se não houver check-in
+        self.acao = acao
+        self.ativo = True
+
+
+class RegistroDeInterruptores:
+    def __init__(self, resolucao=0.01, trabalhadores=4):
+        self.resolucao = resolucao
+        self.niveis = [[[] for _ in range(POSICOES)] for _ in range(NIVEIS)]
+        self.transbordo = []
+        self.interruptores = {}
+        self.trava = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=trabalhadores)
+        self.inicio = time.monotonic()
+        self.tick = 0  # próximo tick a processar
+        self.rodando = False
+        self.thread = None
+
+    def _tick_de(self, segundos_a_partir_de_agora):
+        # Primeiro tick que começa depois do instante pedido; o interruptor nunca dispara antes da hora
+        return math.ceil((time.monotonic() - self.inicio + segundos_a_partir_de_agora) / self.resolucao)
+
+    def registrar(self, identificador, timeout, acao):
+        interruptor = Interruptor(identificador, math.ceil(timeout / self.resolucao), self._tick_de(timeout), acao)
+        with self.trava:
+            # Registrar de novo um identificador ativo substitui o interruptor: o antigo continua na roda até
+            # sua posição vencer, mas inativo
+            anterior = self.interruptores.get(identificador)
+            if anterior is not None:
+                anterior.ativo = False
+            self.interruptores[identificador] = interruptor
+            self._inserir(interruptor)
+
+    def check_in(self, identificador):
+        # O(1) e sem trava: a roda só confere o prazo quando a posição antiga vencer. Retorna False se o
+        # interruptor não existe (nunca registrado, removido ou já disparado): o check-in chegou tarde demais
+        interruptor = self.interruptores.get(identificador)
+        if interruptor is None:
+            return False
+        interruptor.prazo = self._tick_de(interruptor.intervalo * self.resolucao)
+        return True
+
+    def remover(self, identificador):
+        with self.trava:
+            interruptor = self.interruptores.pop(identificador, None)
+            if interruptor is not None:
+                interruptor.ativo = False
+
+    def _inserir(self, interruptor):
+        prazo = max(interruptor.prazo, self.tick)
+        # O nível é o do grupo de 6 bits mais alto em que o prazo difere do tick atual
+        nivel = ((prazo ^ self.tick).bit_length() - 1) // BITS_POR_NIVEL if prazo != self.tick else 0
+        if nivel >= NIVEIS:
+            self.transbordo.append(interruptor)
+        else:
+            self.niveis[nivel][(prazo >> (BITS_POR_NIVEL * nivel)) & MASCARA].append(interruptor)
+
+    def _avancar(self):
+        # Processa o tick atual e retorna os interruptores vencidos
+        tick = self.tick
+        if tick & MASCARA == 0 and tick:
+            # Redistribui, do nível mais alto para o mais baixo, as posições pelas quais o contador acabou de passar
+            nivel = 1
+            while nivel < NIVEIS and (tick >> (BITS_POR_NIVEL * nivel)) & MASCARA == 0:
+                nivel += 1
+            if nivel == NIVEIS:
+                pendentes, self.transbordo = self.transbordo, []
+                for interruptor in pendentes:
+                    self._inserir(interruptor)
+            for n in range(min(nivel, NIVEIS - 1), 0, -1):
+                posicao = (tick >> (BITS_POR_NIVEL * n)) & MASCARA
+                pendentes, self.niveis[n][posicao] = self.niveis[n][posicao], []
+                for interruptor in pendentes:
+                    self._inserir(interruptor)
+
+        vencidos = []
+        posicao = tick & MASCARA
+        pendentes, self.niveis[0][posicao] = self.niveis[0][posicao], []
+        for interruptor in pendentes:
+            if not interruptor.ativo:
+                continue
+            if interruptor.prazo > tick:
+                self._inserir(interruptor)  # houve check-in depois da inserção
+            else:
+                interruptor.ativo = False
+                if self.interruptores.get(interruptor.identificador) is interruptor:
+                    del self.interruptores[interruptor.identificador]
+                vencidos.append(interruptor)
+        self.tick = tick + 1
+        return vencidos
+
+    def _executar(self):
+        while self.rodando:
+            alvo = int((time.monotonic() - self.inicio) / self.resolucao)
+            vencidos = []
+            with self.trava:
+                while self.tick <= alvo:
+                    vencidos.extend(self._avancar())
+            for i in range(0, len(vencidos), TAMANHO_LOTE):
+                self.executor.submit(_disparar, vencidos[i:i + TAMANHO_LOTE])
+            espera = self.inicio + self.tick * self.resolucao - time.monotonic()
+            if espera > 0:
+                time.sleep(espera)
+
+    def iniciar(self):
+        self.rodando = True
+        self.thread = threading.Thread(target=self._executar, daemon=True)
+        self.thread.start()
+
+    def parar(self):
+        self.rodando = False
+        self.thread.join()
+        self.executor.shutdown(wait=True)
+
+    def __len__(self):
+        return len(self.interruptores)
+
+
+def _disparar(interruptores):
+    # Uma ação que falha não pode impedir as demais ações de emergência do mesmo lote
+    for interruptor in interruptores:
+        try:
+            interruptor.acao(interruptor.identificador)
+        except Exception as erro:
+            print(f"Erro na ação de emergência de {interruptor.identificador!r}: {erro!r}")
+
+
+if __name__ == "__main__":
+    registro = RegistroDeInterruptores(resolucao=0.01)
+    registro.iniciar()
+
+    # O exemplo original: check-ins a cada 0,5s param depois de 3 vezes e a ação dispara 2s depois do último
+    disparou = threading.Event()
+
+    def acao_de_emergencia(identificador):
+        print(f"Ação de emergência ({identificador}): Check-in falhou!")
+        disparou.set()
+
+    registro.registrar("principal", 2.0, acao_de_emergencia)
+    for _ in range(3):
+        time.sleep(0.5)
+        registro.check_in("principal")
+        print("Check-in realizado.")
+    disparou.wait()
+    print("Check-in depois do disparo:", "aceito" if registro.check_in("principal") else "recusado")
+
+    # Um milhão de interruptores: metade faz check-in, e todos devem disparar sem adiantar e com pouco atraso
+    quantidade = 1_000_000
+    referencia = [0.0] * quantidade  # instante (antes do registro ou do check-in) + timeout
+    disparos = [0.0] * quantidade
+    timeouts = [random.uniform(10.0, 15.0) for _ in range(quantidade)]
+
+    def registrar_disparo(identificador):
+        disparos[identificador] = time.monotonic()
+
+    inicio = time.perf_counter()
+    for i in range(quantidade):
+        referencia[i] = time.monotonic() + timeouts[i]
+        registro.registrar(i, timeouts[i], registrar_disparo)
+    print(f"{quantidade} interruptores registrados em {time.perf_counter() - inicio:.2f}s")
+
+    inicio = time.perf_counter()
+    for i in range(0, quantidade, 2):
+        referencia[i] = time.monotonic() + timeouts[i]
+        registro.check_in(i)
+    duracao = time.perf_counter() - inicio
+    print(f"{quantidade // 2} check-ins em {duracao:.2f}s ({quantidade / 2 / duracao:,.0f}/s)")
+
+    while len(registro):
+        time.sleep(0.1)
+    registro.parar()
+
+    atrasos = sorted(d - r for d, r in zip(disparos, referencia))
+    print(f"Disparos: {sum(1 for d in disparos if d)}, adiantados: {sum(1 for a in atrasos if a < 0)}, "
+          f"atraso mediano {atrasos[len(atrasos) // 2] * 1e3:.1f} ms, máximo {atrasos[-1] * 1e3:.1f} ms")
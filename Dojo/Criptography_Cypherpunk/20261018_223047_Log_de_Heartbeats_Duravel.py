@@ -0,0 +1,280 @@
+# Este código torna durável o estado do Dead Man Switch: o horário do último check-in de cada interruptor.
+# Cada check-in atualiza o estado em memória e entra numa fila; uma thread gravadora junta tudo o que chegou em
+# um lote e o grava no log de escrita antecipada (WAL) com um único write e um único fsync (group commit), a cada
+# poucos milissegundos ou assim que N registros se acumulam. Quem precisa da garantia espera o lote ser persistido.
+# De tempos em tempos, o log é trocado por um novo e uma cópia compacta do estado (snapshot) é gravada em outra
+# thread; quando ela está no disco, os logs e snapshots antigos são apagados. Na inicialização, o estado é
+# recuperado do último snapshot mais o(s) log(s) seguinte(s), então o tempo de recuperação é limitado pelo
+# tamanho máximo de log entre snapshots. Um lote cortado no meio por uma queda é detectado pelo CRC e descartado.
+# Para executar, não são necessárias bibliotecas externas, apenas o Python padrão.
+
+import os
+import random
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from collections import deque
+from itertools import chain
+
+CABECALHO_LOTE = struct.Struct("<II")       # quantidade de registros, CRC32 dos dados
+CABECALHO_SNAPSHOT = struct.Struct("<QI")   # quantidade de interruptores, CRC32 dos dados
+# Registros são pares (identificador, timestamp em ns) de 64 bits sem sinal, no formato nativo da máquina:
+# o log não sai dela, e assim array.tobytes/frombytes serializam um lote inteiro de uma vez.
+TAMANHO_REGISTRO = 16
+LIMITE_IDENTIFICADOR = 1 << 64
+
+
+def _sincronizar_diretorio(diretorio):
+    # Torna duráveis a criação, a renomeação e a remoção de arquivos no diretório
+    fd = os.open(diretorio, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _aplicar(estado, dados):
+    # O último check-in é o de maior timestamp, então reaplicar um registro é inofensivo (idempotente)
+    registros = array("Q")
+    registros.frombytes(dados)
+    iterador = iter(registros)
+    for identificador, instante in zip(iterador, iterador):
+        if instante > estado.get(identificador, 0):
+            estado[identificador] = instante
+
+
+class LogDeHeartbeats:
+    def __init__(self, diretorio, intervalo=0.002, max_lote=10_000, limite_snapshot=2_000_000):
+        self.diretorio = diretorio
+        self.intervalo = intervalo              # espera máxima entre group commits, em segundos
+        self.max_lote = max_lote                # grava antes do intervalo se houver tantos registros pendentes
+        self.limite_snapshot = limite_snapshot  # registros no log que disparam um novo snapshot
+        self.estado = {}
+        self.fila = deque()
+        self.cheio = threading.Condition()
+        self.persistido = threading.Condition()
+        self.lote_atual = 0
+        self.lote_persistido = -1
+        self.registros_no_log = 0
+        self.thread_snapshot = None
+        self.erro = None  # falha da thread gravadora; a partir dela nenhum check-in é aceito
+        os.makedirs(diretorio, exist_ok=True)
+        self.geracao, self.registros_recuperados = self._recuperar()
+        self.log = open(self._caminho("wal", self.geracao), "ab")
+        _sincronizar_diretorio(diretorio)
+        # Tudo o que foi reaplicado está depois do último snapshot e seria reaplicado de novo na próxima
+        # recuperação: conta para o limite, e um log já longo demais vira snapshot agora
+        self.registros_no_log = self.registros_recuperados
+        if self.registros_no_log >= self.limite_snapshot:
+            self._iniciar_snapshot()
+        self.rodando = True
+        self.thread = threading.Thread(target=self._gravar, daemon=True)
+        self.thread.start()
+
+    def _caminho(self, tipo, geracao):
+        return os.path.join(self.diretorio, f"{tipo}_{geracao:08d}.dat")
+
+    def _geracoes(self, tipo):
+        prefixo = f"{tipo}_"
+        return sorted(int(nome[len(prefixo):-4]) for nome in os.listdir(self.diretorio)
+                      if nome.startswith(prefixo) and nome.endswith(".dat"))
+
+    def _recuperar(self):
+        # Último snapshot íntegro + todos os logs da mesma geração em diante; retorna (geração, registros lidos)
+        geracao = 0
+        for candidata in reversed(self._geracoes("snapshot")):
+            with open(self._caminho("snapshot", candidata), "rb") as arquivo:
+                conteudo = arquivo.read()
+            quantidade, crc = CABECALHO_SNAPSHOT.unpack_from(conteudo)
+            dados = conteudo[CABECALHO_SNAPSHOT.size:]
+            if len(dados) == quantidade * TAMANHO_REGISTRO and zlib.crc32(dados) == crc:
+                _aplicar(self.estado, dados)
+                geracao = candidata
+                break
+
+        registros = 0
+        for g in self._geracoes("wal"):
+            if g < geracao:
+                continue
+            caminho = self._caminho("wal", g)
+            with open(caminho, "rb") as arquivo:
+                conteudo = arquivo.read()
+            posicao = 0
+            while posicao + CABECALHO_LOTE.size <= len(conteudo):
+                quantidade, crc = CABECALHO_LOTE.unpack_from(conteudo, posicao)
+                inicio = posicao + CABECALHO_LOTE.size
+                dados = conteudo[inicio:inicio + quantidade * TAMANHO_REGISTRO]
+                if len(dados) != quantidade * TAMANHO_REGISTRO or zlib.crc32(dados) != crc:
+                    break
+                _aplicar(self.estado, dados)
+                registros += quantidade
+                posicao = inicio + len(dados)
+            if posicao < len(conteudo):
+                # Final cortado por uma queda: nunca foi confirmado a ninguém, então é descartado
+                with open(caminho, "r+b") as arquivo:
+                    arquivo.truncate(posicao)
+                    os.fsync(arquivo.fileno())
+            geracao = max(geracao, g)
+        return geracao, registros
+
+    def check_in(self, identificador):
+        # Validado aqui, e não na thread gravadora: um identificador inválido no lote a derrubaria.
+        # Rótulos como "principal" devem ser mapeados para inteiros pelo chamador.
+        if type(identificador) is not int:
+            raise TypeError(f"Identificador deve ser inteiro, não {type(identificador).__name__}")
+        if not 0 <= identificador < LIMITE_IDENTIFICADOR:
+            raise ValueError(f"Identificador fora do intervalo [0, 2**64): {identificador}")
+        if self.erro is not None:
+            raise RuntimeError("O log de heartbeats parou de gravar") from self.erro
+        instante = time.time_ns()
+        self.estado[identificador] = instante
+        self.fila.append((identificador, instante))
+        if len(self.fila) >= self.max_lote:
+            with self.cheio:
+                self.cheio.notify()
+
+    def aguardar_persistencia(self, timeout=None):
+        # Bloqueia até que todos os check-ins já feitos por esta thread estejam no log em disco
+        alvo = self.lote_atual
+        with self.persistido:
+            persistido = self.persistido.wait_for(
+                lambda: self.lote_persistido >= alvo or self.erro is not None, timeout)
+        if self.erro is not None and self.lote_persistido < alvo:
+            raise RuntimeError("O log de heartbeats parou de gravar") from self.erro
+        return persistido
+
+    def ultimo_check_in(self, identificador):
+        return self.estado.get(identificador)
+
+    def _gravar(self):
+        # Se a gravação falhar (disco cheio, erro de E/S...), quem espera pela persistência é acordado com o erro
+        try:
+            self._gravar_lotes()
+        except Exception as erro:
+            with self.persistido:
+                self.erro = erro
+                self.persistido.notify_all()
+            raise
+
+    def _gravar_lotes(self):
+        while self.rodando or self.fila:
+            with self.cheio:
+                self.cheio.wait_for(lambda: len(self.fila) >= self.max_lote or not self.rodando, self.intervalo)
+
+            lote = self.lote_atual
+            self.lote_atual += 1
+            pendentes = len(self.fila)
+            if pendentes:
+                registros = [self.fila.popleft() for _ in range(pendentes)]
+                dados = array("Q", chain.from_iterable(registros)).tobytes()
+                # Group commit: um write e um fsync para o lote inteiro
+                self.log.write(CABECALHO_LOTE.pack(pendentes, zlib.crc32(dados)) + dados)
+                self.log.flush()
+                os.fsync(self.log.fileno())
+                self.registros_no_log += pendentes
+
+            with self.persistido:
+                self.lote_persistido = lote
+                self.persistido.notify_all()
+
+            if self.registros_no_log >= self.limite_snapshot:
+                self._iniciar_snapshot()
+
+    def _iniciar_snapshot(self):
+        if self.thread_snapshot is not None:
+            self.thread_snapshot.join()
+        # Troca de log: tudo o que está nos logs anteriores já foi aplicado ao estado antes de entrar na fila,
+        # então a cópia tirada agora os cobre; check-ins posteriores vão para o novo log
+        self.log.close()
+        self.geracao += 1
+        self.log = open(self._caminho("wal", self.geracao), "ab")
+        _sincronizar_diretorio(self.diretorio)
+        self.registros_no_log = 0
+        copia = self.estado.copy()
+        self.thread_snapshot = threading.Thread(target=self._gravar_snapshot, args=(self.geracao, copia))
+        self.thread_snapshot.start()
+
+    def _gravar_snapshot(self, geracao, estado):
+        dados = array("Q", chain.from_iterable(estado.items())).tobytes()
+        caminho = self._caminho("snapshot", geracao)
+        temporario = caminho + ".tmp"
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(CABECALHO_SNAPSHOT.pack(len(estado), zlib.crc32(dados)))
+            arquivo.write(dados)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+        _sincronizar_diretorio(self.diretorio)
+        # Só agora os arquivos antigos deixam de ser necessários para a recuperação
+        for tipo in ("wal", "snapshot"):
+            for g in self._geracoes(tipo):
+                if g < geracao:
+                    os.remove(self._caminho(tipo, g))
+        _sincronizar_diretorio(self.diretorio)
+
+    def fechar(self):
+        self.rodando = False
+        with self.cheio:
+            self.cheio.notify()
+        self.thread.join()
+        if self.thread_snapshot is not None:
+            self.thread_snapshot.join()
+        self.log.close()
+
+
+def produtor(log, identificadores, rodadas, tamanho_rajada):
+    # Rajadas de check-ins, cada uma confirmada como durável antes da próxima
+    for _ in range(rodadas):
+        for identificador in random.sample(identificadores, tamanho_rajada):
+            log.check_in(identificador)
+        log.aguardar_persistencia()
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as diretorio:
+        log = LogDeHeartbeats(diretorio, limite_snapshot=1_000_000)
+
+        # O exemplo original: um interruptor faz check-in e o estado sobrevive ao reinício
+        log.check_in(0)
+        log.aguardar_persistencia()
+        print("Check-in realizado.")
+
+        # 4 produtores, 100 mil interruptores, check-ins em rajadas de 1000 confirmadas no disco
+        num_produtores, rodadas, tamanho_rajada = 4, 500, 1000
+        identificadores = list(range(100_000))
+        inicio = time.perf_counter()
+        threads = [threading.Thread(target=produtor, args=(log, identificadores, rodadas, tamanho_rajada))
+                   for _ in range(num_produtores)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        duracao = time.perf_counter() - inicio
+        total = num_produtores * rodadas * tamanho_rajada
+        print(f"{total} check-ins duráveis em {duracao:.2f}s ({total / duracao:,.0f}/s), "
+              f"{log.lote_persistido + 1} group commits")
+
+        # Simula uma queda: para sem snapshot final e deixa meio lote no fim do log
+        esperado = dict(log.estado)
+        log.fechar()
+        with open(log._caminho("wal", log.geracao), "ab") as arquivo:
+            arquivo.write(CABECALHO_LOTE.pack(1000, 0) + os.urandom(100))
+
+        inicio = time.perf_counter()
+        recuperado = LogDeHeartbeats(diretorio)
+        print(f"Recuperação: snapshot + {recuperado.registros_recuperados} registros do log "
+              f"em {time.perf_counter() - inicio:.2f}s; arquivos: {sorted(os.listdir(diretorio))}")
+        print("Estado recuperado igual ao confirmado:", recuperado.estado == esperado)
+        print("Último check-in do interruptor 0:", time.ctime(recuperado.ultimo_check_in(0) / 1e9))
+        recuperado.fechar()
+
+        # Com um limite menor, o log reaplicado já passa dele: o snapshot é feito na abertura, e a recuperação
+        # seguinte parte dele
+        LogDeHeartbeats(diretorio, limite_snapshot=500_000).fechar()
+        recuperado = LogDeHeartbeats(diretorio)
+        print(f"Após snapshot na abertura: {recuperado.registros_recuperados} registros do log; "
+              f"estado igual: {recuperado.estado == esperado}")
+        recuperado.fechar()